@@ -4,18 +4,9 @@ import streamlit as st
 from utils.config_loader import load_config
 from utils.authenticator import authenticator
 from utils.styling import set_width_style
-from utils.translator import translate
-from utils.employee_review_analysis import load_review_data, get_basic_statistics, create_rating_distribution_chart, generate_detailed_analysis, create_score_over_time_charts
-from utils.talent_recruitment_analysis import (
-    load_and_preprocess_data, 
-    compute_attrition_and_headcount, 
-    compute_headcount_by_company, 
-    create_company_headcount_chart, 
-    compute_function_wise_attrition, 
-    create_function_wise_chart, 
-    create_comparison_chart
-)
-
+from utils.translator import translate_many
+from utils.plugin_loader import load_pillar
+from utils.tracing import finish_trace, render_trace_panel, span, start_trace
 
 # Load the configuration
 config = load_config()
@@ -28,91 +19,71 @@ def main():
     language = st.sidebar.selectbox("Choose Language", ["English", "Hebrew"])
     target_language = "iw" if language == "Hebrew" else "en"
 
+    # Opt-in timing of this rerun; nothing is recorded while the panel is off
+    trace = start_trace() if st.sidebar.checkbox("Show performance trace") else None
+    try:
+        render_dashboard(target_language)
+    finally:
+        if trace is not None:
+            render_trace_panel(finish_trace(trace))
+
+def render_dashboard(target_language):
     # Authentication check
     if 'authenticated' not in st.session_state or not st.session_state['authenticated']:
         authenticator(target_language)
         return
 
-    # Display user profile information
-    st.sidebar.title(translate("User Profile", target_language))
     user_name = st.session_state.get('user_name', 'ClientX')
     user_job = st.session_state.get('user_job', 'Head of Strategy')
-    st.sidebar.write(translate(f"Name: {user_name}", target_language))
-    st.sidebar.write(translate(f"Job: {user_job}", target_language))
+    pillars = config['pillars']['names']
+    documentation_text = config['documentation']['text']
+
+    # Register every string this render needs and translate them in one batch
+    texts = translate_many([
+        "User Profile",
+        f"Name: {user_name}",
+        f"Job: {user_job}",
+        "Pillar Analysis",
+        "Select Pillar for In-Depth Analysis",
+        "Startup Analysis Dashboard",
+        "### Comprehensive Documentation",
+        documentation_text,
+        "This analysis is currently under construction.",
+        "Analysis details will be displayed here.",
+    ] + [f"{pillar} Analysis" for pillar in pillars], target_language)
+
+    # Display user profile information
+    st.sidebar.title(texts["User Profile"])
+    st.sidebar.write(texts[f"Name: {user_name}"])
+    st.sidebar.write(texts[f"Job: {user_job}"])
 
     # Sidebar for pillar analysis selection
-    st.sidebar.header(translate("Pillar Analysis", target_language))
-    pillars = config['pillars']['names']
+    st.sidebar.header(texts["Pillar Analysis"])
     selected_pillar = st.sidebar.selectbox(
-        translate("Select Pillar for In-Depth Analysis", target_language), pillars)
+        texts["Select Pillar for In-Depth Analysis"], pillars)
 
     # Main dashboard overview
-    st.title(translate("Startup Analysis Dashboard", target_language))
-    # Retrieve and display documentation text from config
-    documentation_text = config['documentation']['text']
-    st.markdown(translate("### Comprehensive Documentation", target_language))
-    st.markdown(translate(documentation_text, target_language))
+    st.title(texts["Startup Analysis Dashboard"])
+    # Display documentation text from config
+    st.markdown(texts["### Comprehensive Documentation"])
+    st.markdown(texts[documentation_text])
 
 
     # Display analysis or under construction message
     if selected_pillar:
-        st.header(translate(f"{selected_pillar} Analysis", target_language))
+        st.header(texts[f"{selected_pillar} Analysis"])
         under_construction = config['under_construction'].get(selected_pillar, False)
         if under_construction:
-            st.warning(translate("This analysis is currently under construction.", target_language))
-        
-        # Inside the 'Talent Excellence and Recruitment' section
-        elif selected_pillar == "Talent Excellence and Recruitment":
-            # Load and preprocess the recruitment data
-            incredibuild_file_path = './data/Incredibuild/HRIS/001_INCREDIBUILD_ALL_PROFILES.csv'  # Replace with the actual path
-            all_profiles_file_path = './data/Incredibuild/HRIS/001_ALL_PROFILES.csv'  # Replace with the actual path
-            incredibuild_data, all_profiles_data = load_and_preprocess_data(incredibuild_file_path, all_profiles_file_path)
-
-            # Compute attrition rates and headcount
-            incredibuild_attrition, incredibuild_headcount = compute_attrition_and_headcount(incredibuild_data)
-            benchmark_attrition, _ = compute_attrition_and_headcount(all_profiles_data)
-            benchmark_headcounts = compute_headcount_by_company(all_profiles_data)
-
-            # Add Incredibuild's headcount to the benchmark_headcounts for comparison
-            benchmark_headcounts['Incredibuild'] = incredibuild_headcount
-
-            # Create and display comparison charts
-            attrition_chart = create_comparison_chart(incredibuild_attrition, benchmark_attrition, 'Attrition Rate Comparison', 'Attrition Rate')
-            headcount_chart = create_company_headcount_chart(benchmark_headcounts, 'Company Headcount Comparison')
-            st.plotly_chart(attrition_chart)
-            st.plotly_chart(headcount_chart)
-
-            # Compute and display function-wise attrition charts
-            incredibuild_function_attrition = compute_function_wise_attrition(incredibuild_data)
-            incredibuild_function_chart = create_function_wise_chart(incredibuild_function_attrition, 'Incredibuild Function-Wise Attrition')
-            st.plotly_chart(incredibuild_function_chart)
-
-            benchmark_function_attrition = compute_function_wise_attrition(all_profiles_data)
-            benchmark_function_chart = create_function_wise_chart(benchmark_function_attrition, 'Benchmark Function-Wise Attrition')
-            st.plotly_chart(benchmark_function_chart)
-
-        # Inside the 'Company Culture Assessment' section
-        elif selected_pillar == "Company Culture Assessment":
-            # Company Culture Assessment
-            review_data_path = './data/Incredibuild/Employees Reviews/reviews_Incredibuild_processed.xlsx' #TODO: change to config
-            review_data = load_review_data(review_data_path)
-            basic_stats = get_basic_statistics(review_data)
-            rating_dist_chart = create_rating_distribution_chart(review_data)
-            detailed_analysis = generate_detailed_analysis(review_data, ["Company Culture"])
-
-            st.write(translate("Basic Statistics:", target_language))
-            st.write(basic_stats)
-            # Displaying rating distribution chart
-            st.plotly_chart(rating_dist_chart)
-            # Displaying score over time charts
-            score_columns = ["Work/Life Balance", "Diversity & Inclusion", "Career Opportunities", "Compensation and Benefits", "Senior Management"]
-            score_time_charts = create_score_over_time_charts(review_data, score_columns)
-            for chart in score_time_charts:
-                st.plotly_chart(chart)
-            st.write(translate("Detailed Analysis:", target_language))
-            st.write(detailed_analysis)
+            st.warning(texts["This analysis is currently under construction."])
+            return
+
+        # Pillars with a registered plugin render themselves; the module is imported on first selection
+        pillar_plugin = load_pillar(selected_pillar)
+        if pillar_plugin is not None:
+            with span(f"render {selected_pillar}"):
+                pillar_plugin.render(target_language)
         else:
-            st.info(translate("Analysis details will be displayed here.", target_language))
+            st.info(texts["Analysis details will be displayed here."])
 
 if __name__ == '__main__':
     main()
@@ -2,20 +2,25 @@ import openai
 import pandas as pd
 import streamlit as st
 from utils.visualizer import draw_plot, draw_pie_chart
-from legacy.data_generator import generate_data
-from openai import OpenAI
+from legacy.data_generator import generate_many, INDICATOR_GENERATORS
 from legacy.scenario_manager import load_scenarios
-from legacy.metrics import display_deviation_metric
+from legacy.metrics import display_deviation_metric, display_top_movers, scan_indicators
 from legacy.query_manager import save_query, load_queries
-from utils.translator import translate
+from utils.translator import translate, translate_many, translate_stream
+from utils.llm_cache import cached_completion, completion_key, get_completion, store_completion
+from utils import llm_gateway
+from legacy.indicator_index import search_indicators, DEFAULT_TOP_K
 
 
-openai.api_key = st.secrets['openai_api_key']
-client = OpenAI(api_key=openai.api_key)  # Initialize the OpenAI client
+
+# Settings shared by the indicator and scenario interpretations
+INTERPRETATION_MODEL = "gpt-3.5-turbo"
+INTERPRETATION_TEMPERATURE = 0.5
+INTERPRETATION_MAX_TOKENS = 500
 
 def generative_ai_mode(config, target_language):
     st.sidebar.title(translate("Advanced Analytics Mode (GenAI)", target_language))
-    mode = st.sidebar.radio(translate("Choose an option", target_language), [translate("Query Indicators", target_language), translate("Interpret Scenario", target_language)])
+    mode = st.sidebar.radio(translate("Choose an option", target_language), [translate("Query Indicators", target_language), translate("Interpret Scenario", target_language), translate("What Moved This Week", target_language)])
 
     if mode == translate("Query Indicators", target_language):
         # Existing functionality for querying indicators
@@ -23,6 +28,30 @@ def generative_ai_mode(config, target_language):
     elif mode == translate("Interpret Scenario", target_language):
         # New functionality for interpreting scenario challenges
         handle_interpret_scenario(config, target_language)
+    elif mode == translate("What Moved This Week", target_language):
+        # Biggest movers across every indicator
+        handle_top_movers(target_language)
+
+def handle_top_movers(target_language):
+    """
+    Shows the indicators whose last weeks deviate most from the year before, across all indicators.
+    """
+    top_n = st.sidebar.slider(translate("Number of indicators", target_language), 5, 50, 10)
+    display_top_movers(list(INDICATOR_GENERATORS), target_language, top_n=top_n)
+
+def indicator_page_strings(indicators):
+    """
+    Return the per-indicator labels rendered by the indicator grids, for batch translation.
+    """
+    strings = []
+    for indicator in indicators:
+        strings += [
+            f"Set threshold for {indicator}",
+            f"Show more about {indicator}",
+            f"Show average difference for {indicator}",
+            f"Show percentage difference for {indicator}",
+        ]
+    return strings
 
 def handle_query_indicators(config, target_language):
     """
@@ -44,10 +73,17 @@ def handle_query_indicators(config, target_language):
         all_indicators = get_all_indicators_list(config)
 
         # Process the user's instruction and get relevant indicators
-        indicators, rationale = process_instructions(instruction, all_indicators)
+        indicators, rationale = process_instructions(instruction, all_indicators, target_language)
+
+        # Translate every label this page needs in one batch
+        texts = translate_many(indicator_page_strings(indicators) + [
+            "AI's rationale for selecting indicators:",
+            "Collective Interpretation for Selected Indicators:",
+            "No valid indicators were selected based on the query.",
+        ], target_language)
 
         # Display the AI's rationale for the indicator selection
-        st.write(translate("AI's rationale for selecting indicators:", target_language))
+        st.write(texts["AI's rationale for selecting indicators:"])
         st.write(rationale)
 
         # Display plots for each indicator, three per row
@@ -59,22 +95,21 @@ def handle_query_indicators(config, target_language):
                         indicator = indicators[i + j]
                         if indicator in all_indicators:
                             # Add a number input for setting the threshold
-                            threshold = st.number_input(translate(f"Set threshold for {indicator}", target_language), key=f"threshold_{indicator}")
+                            threshold = st.number_input(texts[f"Set threshold for {indicator}"], key=f"threshold_{indicator}")
                             # Redraw the plot with the new threshold
                             fig = draw_plot(indicator, target_language, threshold=threshold)
                             st.plotly_chart(fig, use_container_width=True)
 
-                            with st.expander(translate(f"Show more about {indicator}", target_language)):
-                                avg_diff_checkbox = st.checkbox(translate(f"Show average difference for {indicator}", target_language), key=f"avg_diff_{indicator}")
-                                pct_diff_checkbox = st.checkbox(translate(f"Show percentage difference for {indicator}", target_language), key=f"pct_diff_{indicator}")
+                            with st.expander(texts[f"Show more about {indicator}"]):
+                                avg_diff_checkbox = st.checkbox(texts[f"Show average difference for {indicator}"], key=f"avg_diff_{indicator}")
+                                pct_diff_checkbox = st.checkbox(texts[f"Show percentage difference for {indicator}"], key=f"pct_diff_{indicator}")
                                 if avg_diff_checkbox or pct_diff_checkbox:
-                                    display_deviation_metric(indicator, avg_diff_checkbox, pct_diff_checkbox)
+                                    display_deviation_metric(indicator, avg_diff_checkbox, pct_diff_checkbox, target_language, scan_indicators(indicators))
 
         # Generate and display a collective interpretation for all indicators
         if indicators:
-            collective_interpretation = interpret_indicators_set(indicators, config)
-            st.write(translate("Collective Interpretation for Selected Indicators:", target_language))
-            st.write(collective_interpretation)
+            st.write(texts["Collective Interpretation for Selected Indicators:"])
+            collective_interpretation = render_interpretation(build_indicators_set_prompt(indicators), target_language)
 
             """
             # Save the query to the session state
@@ -84,52 +119,92 @@ def handle_query_indicators(config, target_language):
                 st.success(f"Query '{query_name}' saved!")
             """
         else:
-            st.write(translate("No valid indicators were selected based on the query.", target_language))
+            st.write(texts["No valid indicators were selected based on the query."])
     
     #elif query_mode == "Load Saved Query":
     #    load_saved_query()
 
 
-def interpret_indicators_set(indicators, config):
+def build_indicators_set_prompt(indicators):
+    """
+    Build the prompt asking for a collective interpretation of a set of indicators.
+    """
+    narrative = "Analyzing the following indicators:\n\n"
+    
+    # Generate every indicator in one batch and append the last 12 weeks of each to the narrative
+    dates, matrix = generate_many(indicators)
+    recent_dates = dates[-12:].strftime("%Y-%m-%d")
+    for indicator, data in zip(indicators, matrix):
+        df = pd.DataFrame({'Date': recent_dates, 'Value': data[-12:]})
+        narrative += f"{indicator}:\n{df.to_string(index=False)}\n\n"
+
+    # Add a prompt for the AI to interpret the collective data
+    return narrative + "Please provide a comprehensive interpretation of the trends and implications based on the above indicators."
+
+def interpret_indicators_set(indicators, config, refresh=False):
     """
     Generate a collective interpretation for a set of indicators.
 
     Parameters:
     indicators (list): A list of indicators.
     config (dict): The configuration dictionary.
+    refresh (bool): Bypass the completion cache.
 
     Returns:
     str: The collective interpretation of the indicators.
     """
-    narrative = "Analyzing the following indicators:\n\n"
-    
-    # Loop through each indicator and append its data to the narrative
-    for indicator in indicators:
-        dates, data = generate_data(indicator)
-        data_points = list(zip([date.strftime("%Y-%m-%d") for date in dates[-12:]], data[-12:]))
-        df = pd.DataFrame(data_points, columns=['Date', 'Value'])
-        narrative += f"{indicator}:\n{df.to_string(index=False)}\n\n"
+    return get_interpretation(build_indicators_set_prompt(indicators), refresh=refresh)
 
-    # Add a prompt for the AI to interpret the collective data
-    prompt = narrative + "Please provide a comprehensive interpretation of the trends and implications based on the above indicators."
+def _interpretation_messages(prompt):
+    return [{"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt}]
 
-    # Query OpenAI API for interpretation
+def get_interpretation(prompt, refresh=False):
+    """
+    Query OpenAI API for an interpretation and wait for the whole completion.
+    """
+    messages = _interpretation_messages(prompt)
+    def create():
+        return llm_gateway.complete(messages, INTERPRETATION_MODEL, INTERPRETATION_TEMPERATURE, INTERPRETATION_MAX_TOKENS, n=1)
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "system", "content": "You are a helpful assistant."},
-                      {"role": "user", "content": prompt}],
-            temperature=0.5,
-            max_tokens=500,
-            stop=None,
-            n=1
-        )
-        interpretation = next((choice.message.content for choice in response.choices if choice.message.role == 'assistant'), '')
-        return interpretation
-    except openai.OpenAIError as e:
+        return cached_completion(create, INTERPRETATION_MODEL, messages, INTERPRETATION_TEMPERATURE, INTERPRETATION_MAX_TOKENS, refresh=refresh)
+    except (openai.OpenAIError, TimeoutError) as e:
         return f"An error occurred while generating the interpretation: {str(e)}"
 
-
+def stream_interpretation(prompt, refresh=False):
+    """
+    Query OpenAI API for an interpretation and yield the text as tokens arrive.
+    A cached completion is yielded in one piece; a streamed one is cached once complete.
+    """
+    messages = _interpretation_messages(prompt)
+    key = completion_key(INTERPRETATION_MODEL, messages, INTERPRETATION_TEMPERATURE, INTERPRETATION_MAX_TOKENS)
+    cached = None if refresh else get_completion(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    try:
+        for delta in llm_gateway.stream(messages, INTERPRETATION_MODEL, INTERPRETATION_TEMPERATURE, INTERPRETATION_MAX_TOKENS, n=1):
+            parts.append(delta)
+            yield delta
+    except (openai.OpenAIError, TimeoutError) as e:
+        yield f"An error occurred while generating the interpretation: {str(e)}"
+        return
+    if parts:
+        store_completion(key, INTERPRETATION_MODEL, ''.join(parts))
+
+def render_interpretation(prompt, target_language, refresh=False):
+    """
+    Write an interpretation into the page as it streams in, translating it sentence by sentence.
+    Returns the rendered text.
+    """
+    placeholder = st.empty()
+    text = ''
+    for piece in translate_stream(stream_interpretation(prompt, refresh=refresh), target_language):
+        text += piece
+        placeholder.markdown(text)
+    return text
 
 
 def handle_interpret_scenario(config, target_language):
@@ -151,11 +226,16 @@ def handle_interpret_scenario(config, target_language):
 
         # Button to generate analytics for the selected challenge
         if st.sidebar.button(translate("Analyze Challenge", target_language)):
-            st.header(translate(f"Advanced Analytics for Challenge: {selected_challenge}", target_language))
-
             # Get the indicators for the selected challenge
             indicators = scenario_data['challenges'][selected_challenge]
 
+            # Translate every label this page needs in one batch
+            texts = translate_many(indicator_page_strings(indicators) + [
+                f"Advanced Analytics for Challenge: {selected_challenge}",
+                "Comprehensive Interpretation:",
+            ], target_language)
+            st.header(texts[f"Advanced Analytics for Challenge: {selected_challenge}"])
+
             # Display plots for each indicator, three per row
             for i in range(0, len(indicators), 3):
                 cols = st.columns(3)
@@ -167,122 +247,107 @@ def handle_interpret_scenario(config, target_language):
                                 st.plotly_chart(fig, use_container_width=True)
                             else:
                                 # Add a number input for setting the threshold
-                                threshold = st.number_input(translate(f"Set threshold for {indicators[i + j]}", target_language), key=f"threshold_{indicators[i + j]}")
+                                threshold = st.number_input(texts[f"Set threshold for {indicators[i + j]}"], key=f"threshold_{indicators[i + j]}")
 
                                 # Redraw the plot with the new threshold
                                 fig = draw_plot(indicators[i + j], target_language, threshold=threshold)
                                 st.plotly_chart(fig, use_container_width=True)
 
-                                with st.expander(translate(f"Show more about {indicators[i + j]}", target_language)):
-                                    avg_diff_checkbox = st.checkbox(translate(f"Show average difference for {indicators[i + j]}", target_language), key=f"avg_diff_{indicators[i + j]}")
-                                    pct_diff_checkbox = st.checkbox(translate(f"Show percentage difference for {indicators[i + j]}", target_language), key=f"pct_diff_{indicators[i + j]}")
+                                with st.expander(texts[f"Show more about {indicators[i + j]}"]):
+                                    avg_diff_checkbox = st.checkbox(texts[f"Show average difference for {indicators[i + j]}"], key=f"avg_diff_{indicators[i + j]}")
+                                    pct_diff_checkbox = st.checkbox(texts[f"Show percentage difference for {indicators[i + j]}"], key=f"pct_diff_{indicators[i + j]}")
                                     if avg_diff_checkbox or pct_diff_checkbox:
-                                        display_deviation_metric(indicators[i + j], avg_diff_checkbox, pct_diff_checkbox)
+                                        display_deviation_metric(indicators[i + j], avg_diff_checkbox, pct_diff_checkbox, target_language, scan_indicators(indicators))
 
             # Generate and display a comprehensive interpretation for the challenge
-            interpretation = interpret_scenario_challenge(selected_challenge, indicators, config)
-            st.write(translate("Comprehensive Interpretation:", target_language))
-            st.write(translate(interpretation, target_language))
+            st.write(texts["Comprehensive Interpretation:"])
+            render_interpretation(build_scenario_challenge_prompt(selected_challenge, indicators), target_language)
 
 
 
-def process_instructions(instruction, all_indicators, target_language):
+def process_instructions(instruction, all_indicators, target_language, refresh=False, rerank=True, top_k=DEFAULT_TOP_K):
+    """
+    Select the indicators relevant to an instruction.
+
+    The local TF-IDF index shortlists the top_k indicators closest to the instruction. With
+    rerank, the LLM picks from that shortlist and its reply is the rationale; otherwise the
+    shortlist is returned as ranked. The full list is only sent when nothing matches locally.
+    """
+    exclude_indicators = {"Map of Construction Sites", "Percentage of Reservists per Industry"}
+    selectable = [ind for ind in all_indicators if ind not in exclude_indicators]
+    candidates = [indicator for indicator, _ in search_indicators(instruction, selectable, k=top_k)]
+
+    if candidates and not rerank:
+        rationale = translate("Indicators ranked by similarity to your request.", target_language)
+        return candidates, rationale
+
+    options = candidates or selectable
     # Creating a prompt for the AI to understand that it should choose from a list
     prompt = f"Based on the following instruction: '{instruction}', " \
              f"which of these indicators would be most relevant to focus on? " \
              f"Please provide a list of indicators listed with '- ' prefix.\n\n" \
-             f"Options: {', '.join(all_indicators)}\n\n" \
+             f"Options: {', '.join(options)}\n\n" \
              f"Selected indicators:"
+    messages = [{"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}]
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",  # Specify the GPT-3.5 chat model
-        messages=[{"role": "system", "content": "You are a helpful assistant."},
-                  {"role": "user", "content": prompt}]
-    )
-
-    exclude_indicators = {"Map of Construction Sites", "Percentage of Reservists per Industry"}
-
-    # Check if the response has a 'choices' attribute and if it's not empty
-    if hasattr(response, 'choices') and response.choices:
-        # Extract the full content from the assistant's message for rationale
-        assistant_message = next((choice.message.content for choice in response.choices if choice.message.role == 'assistant'), '')
+    # Extract the full content from the assistant's message for rationale
+    assistant_message = cached_completion(lambda: llm_gateway.complete(messages, "gpt-3.5-turbo"),  # Specify the GPT-3.5 chat model
+                                          "gpt-3.5-turbo", messages, None, None, refresh=refresh)
 
-        # Initialize an empty list for indicators
-        indicators = []
+    if assistant_message:
         rationale = assistant_message  # Store the full assistant message as rationale
+        # Case-insensitive lookup of the offered indicators
+        known_indicators = {indicator.lower(): indicator for indicator in options}
 
-        # Assume the AI's response contains a comma-separated list of indicators
-        lines = assistant_message.split(',')
-        for line in lines:
-            # Remove any leading or trailing whitespace
-            indicator = line.strip()
-            # Attempt to match the extracted indicator with the application's known indicators
-            matched_indicator = next((known_indicator for known_indicator in all_indicators
-                                    if known_indicator.lower() == indicator.lower()), None)
-            if matched_indicator:
-                indicators.append(matched_indicator)
-
-        # # Assumes indicators are listed with '- ' prefix
-        lines = assistant_message.split('\n')
-        for line in lines:
+        # The reply may list indicators comma-separated or one per line with a '- ' or '• ' prefix
+        entries = [entry.strip() for entry in assistant_message.split(',')]
+        for line in assistant_message.split('\n'):
             line = line.strip()
             if line.startswith("- ") or line.startswith("• "):
-                indicator = line[2:]  # Remove the '- ' prefix
-                if indicator in all_indicators:  # Check if the indicator is recognized
-                    indicators.append(indicator)
-        
-        # Filter out specific indicators
-        indicators = [ind for ind in indicators if ind not in exclude_indicators]
+                entries.append(line[2:].strip())  # Remove the '- ' prefix
 
+        matched = (known_indicators.get(entry.lower()) for entry in entries)
+        indicators = list(dict.fromkeys(indicator for indicator in matched if indicator))
         return indicators, rationale
     else:
-        # Handle the case where response.choices is empty or not as expected
+        # Handle the case where the response is empty or not as expected
         return [], translate("No response received from AI.", target_language)
 
-def interpret_scenario_challenge(challenge_name, indicators, config):
+def build_scenario_challenge_prompt(challenge_name, indicators):
     """
-    Interpret a set of indicators for a challenge using OpenAI's language model.
-
-    Parameters:
-    challenge_name (str): The name of the challenge.
-    indicators (list): A list of indicators for the challenge.
-    config (dict): The configuration dictionary.
-
-    Returns:
-    str: The collective interpretation of the indicators for the challenge.
+    Build the prompt asking for an interpretation of a challenge's indicators.
     """
-    
     exclude_indicators = {"Map of Construction Sites", "Percentage of Reservists per Industry"}
     # Filter out specific indicators
     indicators = [ind for ind in indicators if ind not in exclude_indicators]
 
     narrative = f"Challenge: {challenge_name}\n\n"
     
-    # Loop through each indicator and append its data to the narrative
-    for indicator in indicators:
-        dates, data = generate_data(indicator)
-        data_points = list(zip([date.strftime("%Y-%m-%d") for date in dates[-12:]], data[-12:]))
-        df = pd.DataFrame(data_points, columns=['Date', 'Value'])
+    # Generate every indicator in one batch and append the last 12 weeks of each to the narrative
+    dates, matrix = generate_many(indicators)
+    recent_dates = dates[-12:].strftime("%Y-%m-%d")
+    for indicator, data in zip(indicators, matrix):
+        df = pd.DataFrame({'Date': recent_dates, 'Value': data[-12:]})
         narrative += f"Here is the data for the indicator '{indicator}' over time:\n{df.to_string(index=False)}\n\n"
 
     # Add a prompt for the AI to interpret the collective data
-    prompt = narrative + "Based on the trends in this data for all indicators, please provide a comprehensive interpretation of the situation for this challenge."
+    return narrative + "Based on the trends in this data for all indicators, please provide a comprehensive interpretation of the situation for this challenge."
 
-    # Query OpenAI API for interpretation
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "system", "content": "You are a helpful assistant."},
-                      {"role": "user", "content": prompt}],
-            temperature=0.5,
-            max_tokens=500,
-            stop=None,
-            n=1
-        )
-        interpretation = next((choice.message.content for choice in response.choices if choice.message.role == 'assistant'), '')
-        return interpretation
-    except openai.OpenAIError as e:
-        return f"An error occurred while generating the interpretation: {str(e)}"
+def interpret_scenario_challenge(challenge_name, indicators, config, refresh=False):
+    """
+    Interpret a set of indicators for a challenge using OpenAI's language model.
+
+    Parameters:
+    challenge_name (str): The name of the challenge.
+    indicators (list): A list of indicators for the challenge.
+    config (dict): The configuration dictionary.
+    refresh (bool): Bypass the completion cache.
+
+    Returns:
+    str: The collective interpretation of the indicators for the challenge.
+    """
+    return get_interpretation(build_scenario_challenge_prompt(challenge_name, indicators), refresh=refresh)
     
 
 def load_saved_query(target_language):
@@ -0,0 +1,86 @@
+# legacy/indicator_index.py
+
+import hashlib
+import os
+import re
+import numpy as np
+
+# Persisted indexes, one file per distinct indicator list
+INDEX_DIR = './data/.cache'
+# Candidates handed to the LLM for re-ranking
+DEFAULT_TOP_K = 15
+
+_indexes = {}
+
+def _tokens(text):
+    """
+    Words plus in-word character trigrams, so 'wage' still matches 'Level of wages'.
+    """
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    trigrams = ['#' + word[i:i + 3] for word in words if len(word) > 3 for i in range(len(word) - 2)]
+    return words + trigrams
+
+def _index_key(names, descriptions):
+    payload = '\n'.join(f"{name}\t{descriptions.get(name, '')}" for name in names)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def _build_index(names, descriptions):
+    documents = [_tokens(f"{name} {descriptions.get(name, '')}") for name in names]
+    vocabulary = {token: i for i, token in enumerate(sorted({token for document in documents for token in document}))}
+    counts = np.zeros((len(names), len(vocabulary)))
+    for row, document in enumerate(documents):
+        for token in document:
+            counts[row, vocabulary[token]] += 1
+    # Smoothed inverse document frequency and sublinear term frequency, rows scaled to unit length
+    idf = np.log((1 + len(names)) / (1 + (counts > 0).sum(axis=0))) + 1
+    matrix = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0) * idf
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return {'names': list(names), 'vocabulary': vocabulary, 'idf': idf, 'matrix': matrix}
+
+def load_index(names, descriptions=None):
+    """
+    Return the TF-IDF index over indicator names (and optional descriptions).
+    Built once per distinct indicator list, persisted under INDEX_DIR and kept in memory.
+    """
+    descriptions = descriptions or {}
+    key = _index_key(names, descriptions)
+    if key in _indexes:
+        return _indexes[key]
+
+    index_path = os.path.join(INDEX_DIR, f'indicator_index-{key}.npz')
+    try:
+        stored = np.load(index_path, allow_pickle=False)
+        index = {
+            'names': stored['names'].tolist(),
+            'vocabulary': {token: i for i, token in enumerate(stored['vocabulary'].tolist())},
+            'idf': stored['idf'],
+            'matrix': stored['matrix'],
+        }
+    except (OSError, KeyError, ValueError):
+        index = _build_index(names, descriptions)
+        try:
+            os.makedirs(INDEX_DIR, exist_ok=True)
+            vocabulary = sorted(index['vocabulary'], key=index['vocabulary'].get)
+            np.savez(index_path, names=np.array(index['names']), vocabulary=np.array(vocabulary),
+                     idf=index['idf'], matrix=index['matrix'])
+        except OSError as e:
+            print(f"Indicator index write error: {e}")
+    _indexes[key] = index
+    return index
+
+def search_indicators(query, names, k=DEFAULT_TOP_K, descriptions=None):
+    """
+    Return up to k (indicator, score) pairs ranked by cosine similarity to the query.
+    Indicators sharing no term with the query are left out.
+    """
+    index = load_index(names, descriptions)
+    query_vector = np.zeros(len(index['vocabulary']))
+    for token in _tokens(query):
+        position = index['vocabulary'].get(token)
+        if position is not None:
+            query_vector[position] += 1
+    query_vector = np.where(query_vector > 0, 1 + np.log(np.maximum(query_vector, 1)), 0) * index['idf']
+    query_vector /= max(np.linalg.norm(query_vector), 1e-12)
+    scores = index['matrix'] @ query_vector
+    top = np.argsort(-scores, kind='stable')[:k]
+    return [(index['names'][i], float(scores[i])) for i in top if scores[i] > 0]
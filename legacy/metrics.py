@@ -1,22 +1,97 @@
+import functools
 import streamlit as st
 import numpy as np
-from legacy.data_generator import generate_data
+import pandas as pd
+from legacy.data_generator import generate_many, DEFAULT_SEED
 from utils.translator import translate
 
-def display_deviation_metric(title, show_avg_diff, show_pct_diff, target_language):
+# Compare the average of the last 3 weeks against the 52 weeks before them
+RECENT_WEEKS = 3
+BASELINE_WEEKS = 52
+# A move is flagged when its z-score or percentage change passes these thresholds
+Z_SCORE_THRESHOLD = 2.0
+PCT_CHANGE_THRESHOLD = 10.0
+
+def _window_sums(matrix, window):
+    """
+    Return the sums of every trailing window of each row; column t covers weeks t-window+1..t.
+    """
+    cumulative = np.concatenate([np.zeros((matrix.shape[0], 1)), np.cumsum(matrix, axis=1)], axis=1)
+    return cumulative[:, window:] - cumulative[:, :-window]
+
+def rolling_deviation(matrix, recent_weeks=RECENT_WEEKS, baseline_weeks=BASELINE_WEEKS):
+    """
+    Compare every recent window with the baseline window just before it, for all rows and weeks at once.
+
+    Returns a dict of (rows x windows) arrays: 'recent_mean', 'baseline_mean', 'avg_difference',
+    'pct_difference' and 'z_score'. Column j is the window ending at week baseline_weeks + recent_weeks - 1 + j.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    span = recent_weeks + baseline_weeks
+    recent_mean = _window_sums(matrix, recent_weeks)[:, baseline_weeks:] / recent_weeks
+    baseline_sum = _window_sums(matrix, baseline_weeks)[:, :matrix.shape[1] - span + 1]
+    baseline_square_sum = _window_sums(matrix ** 2, baseline_weeks)[:, :matrix.shape[1] - span + 1]
+    baseline_mean = baseline_sum / baseline_weeks
+    baseline_std = np.sqrt(np.maximum(baseline_square_sum / baseline_weeks - baseline_mean ** 2, 0))
+
+    avg_difference = recent_mean - baseline_mean
+    pct_difference = np.divide(avg_difference * 100, baseline_mean, out=np.zeros_like(avg_difference), where=baseline_mean != 0)
+    z_score = np.divide(avg_difference, baseline_std, out=np.zeros_like(avg_difference), where=baseline_std > 0)
+    return {
+        'recent_mean': recent_mean,
+        'baseline_mean': baseline_mean,
+        'avg_difference': avg_difference,
+        'pct_difference': pct_difference,
+        'z_score': z_score,
+    }
+
+@functools.lru_cache(maxsize=16)
+def _scan(indicators, seed, recent_weeks, baseline_weeks, z_threshold, pct_threshold):
+    dates, matrix = generate_many(indicators, seed)
+    if matrix.shape[1] < recent_weeks + baseline_weeks:
+        return pd.DataFrame()
+    deviation = rolling_deviation(matrix, recent_weeks, baseline_weeks)
+    scan = pd.DataFrame({name: values[:, -1] for name, values in deviation.items()}, index=pd.Index(indicators, name='Indicator'))
+    scan['breach'] = (scan['z_score'].abs() >= z_threshold) | (scan['pct_difference'].abs() >= pct_threshold)
+    scan['as_of'] = dates[-1]
+    return scan.sort_values('z_score', key=np.abs, ascending=False)
+
+def scan_indicators(indicators, seed=DEFAULT_SEED, recent_weeks=RECENT_WEEKS, baseline_weeks=BASELINE_WEEKS,
+                    z_threshold=Z_SCORE_THRESHOLD, pct_threshold=PCT_CHANGE_THRESHOLD):
+    """
+    Return the latest deviation of every indicator, ranked by absolute z-score (biggest movers first).
+    The returned frame is shared between callers and must not be modified.
+    """
+    return _scan(tuple(dict.fromkeys(indicators)), seed, recent_weeks, baseline_weeks, z_threshold, pct_threshold)
+
+def display_top_movers(indicators, target_language, top_n=10):
+    """
+    Display the indicators that moved most in the last weeks.
+    """
+    scan = scan_indicators(indicators)
+    st.subheader(translate("What moved this week", target_language))
+    if scan.empty:
+        st.write(translate("Not enough data to compare.", target_language))
+        return
+    top_movers = scan.head(top_n)[['recent_mean', 'baseline_mean', 'avg_difference', 'pct_difference', 'z_score', 'breach']]
+    st.dataframe(top_movers.style.format({
+        'recent_mean': '{:.2f}', 'baseline_mean': '{:.2f}', 'avg_difference': '{:.2f}',
+        'pct_difference': '{:.2f}%', 'z_score': '{:.2f}'}))
+
+def display_deviation_metric(title, show_avg_diff, show_pct_diff, target_language, scan=None):
     """
     Display the deviation metrics for the given startup scaling indicator.
+    Pass the scan_indicators() result of the page's indicators to avoid a scan per indicator.
     """
     try:
-        dates, data = generate_data(indicator=title)
+        if scan is None or title not in scan.index:
+            scan = scan_indicators([title])
         # Ensure there's enough data to compare
-        if len(data) >= 55:
+        if not scan.empty:
             # Custom logic for analyzing startup data
             # Example: Compare the average of the last 3 data points against the last 52 weeks
-            avg_last_3 = np.mean(data[-3:])
-            avg_last_52 = np.mean(data[-55:-3])
-            avg_difference = avg_last_3 - avg_last_52
-            pct_difference = (avg_difference / avg_last_52) * 100 if avg_last_52 != 0 else 0
+            avg_difference = scan.loc[title, 'avg_difference']
+            pct_difference = scan.loc[title, 'pct_difference']
 
             # Display the average difference
             if show_avg_diff:
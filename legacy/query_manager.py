@@ -1,48 +1,25 @@
 # query_manager.py
 
-import streamlit as st
-import json
-import os
+from legacy.saved_store import load_items, save_item, delete_item
 
-# Define a path for saving query data
+# Queries saved before the SQLite store are imported from this file on first load
 QUERIES_FILE_PATH = 'queries.json'
 
-@st.cache(allow_output_mutation=True)
 def load_queries():
     """
-    Load existing queries from a file.
+    Load existing queries from the store.
     """
-    if os.path.exists(QUERIES_FILE_PATH):
-        with open(QUERIES_FILE_PATH, 'r') as file:
-            queries = json.load(file)
-    else:
-        queries = {}
-    return queries
+    return load_items('query', QUERIES_FILE_PATH)
 
 def save_query(query_name, query_data):
     """
-    Save a new query to the file.
+    Save a new query, replacing any query with the same name.
     """
-    queries = load_queries()  # Load existing queries
-    queries[query_name] = query_data  # Add the new query
-    
-    # Write the updated queries back to the file
-    with open(QUERIES_FILE_PATH, 'w') as file:
-        json.dump(queries, file)
-    
-    # Clear the cache after updating the file
-    st.cache_data.clear()
+    save_item('query', query_name, query_data)
 
 def delete_query(query_name):
     """
-    Delete a query and remove it from the file.
+    Delete a query from the store.
     Returns True if the query was successfully deleted.
     """
-    queries = load_queries()
-    if query_name in queries:
-        del queries[query_name]
-        with open(QUERIES_FILE_PATH, 'w') as file:
-            json.dump(queries, file)
-        st.cache_data.clear()
-        return True
-    return False
+    return delete_item('query', query_name)
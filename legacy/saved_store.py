@@ -0,0 +1,113 @@
+# legacy/saved_store.py
+#
+# SQLite store for the saved queries and scenarios, shared by every session on the server.
+# Each item is one row, so saving or deleting touches only that row. Items are kept in an
+# in-process cache per kind, updated key by key on writes and reloaded only when another
+# connection has committed changes.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SAVED_STORE_PATH = './data/saved_items.sqlite'
+
+_connection = None
+_lock = threading.Lock()
+# kind -> {name: data}, in creation order
+_cache = {}
+_data_version = None
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(SAVED_STORE_PATH), exist_ok=True)
+        _connection = sqlite3.connect(SAVED_STORE_PATH, check_same_thread=False)
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute("PRAGMA busy_timeout=5000")
+        with _connection:
+            _connection.execute(
+                "CREATE TABLE IF NOT EXISTS saved_items ("
+                "kind TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (kind, name))")
+            _connection.execute("CREATE INDEX IF NOT EXISTS saved_items_name ON saved_items (name)")
+            _connection.execute("CREATE INDEX IF NOT EXISTS saved_items_created_at ON saved_items (kind, created_at)")
+            # Kinds whose legacy JSON file has been taken over, so it is never imported again
+            _connection.execute("CREATE TABLE IF NOT EXISTS json_imports (kind TEXT PRIMARY KEY, source TEXT NOT NULL, imported_at REAL NOT NULL)")
+    return _connection
+
+def _check_external_changes(connection):
+    """
+    Drop the cache when another connection (e.g. another server process) has committed since the last check.
+    """
+    global _data_version
+    data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+    if data_version != _data_version:
+        _cache.clear()
+        _data_version = data_version
+
+def _import_json(connection, kind, json_path):
+    """
+    One-time import of the items of a legacy JSON file. The import is recorded, so items
+    deleted afterwards do not come back; stores that already hold items of kind count as imported.
+    """
+    if not json_path:
+        return
+    if connection.execute("SELECT 1 FROM json_imports WHERE kind = ?", (kind,)).fetchone():
+        return
+    items = {}
+    if os.path.exists(json_path) and not connection.execute("SELECT 1 FROM saved_items WHERE kind = ? LIMIT 1", (kind,)).fetchone():
+        with open(json_path, 'r') as file:
+            items = json.load(file)
+    now = time.time()
+    with connection:
+        connection.executemany(
+            "INSERT OR IGNORE INTO saved_items (kind, name, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(kind, name, json.dumps(data), now + i * 1e-6, now + i * 1e-6) for i, (name, data) in enumerate(items.items())])
+        connection.execute("INSERT OR IGNORE INTO json_imports (kind, source, imported_at) VALUES (?, ?, ?)", (kind, json_path, now))
+
+def load_items(kind, json_path=None):
+    """
+    Return {name: data} for every item of kind, oldest first.
+    The returned dict is a copy; the item values are shared and must not be modified.
+    """
+    with _lock:
+        connection = _get_connection()
+        _check_external_changes(connection)
+        if kind not in _cache:
+            _import_json(connection, kind, json_path)
+            rows = connection.execute(
+                "SELECT name, data FROM saved_items WHERE kind = ? ORDER BY created_at", (kind,)).fetchall()
+            _cache[kind] = {name: json.loads(data) for name, data in rows}
+        return dict(_cache[kind])
+
+def save_item(kind, name, data):
+    """
+    Insert or replace one item atomically. Replacing keeps the item's creation time.
+    """
+    now = time.time()
+    with _lock:
+        connection = _get_connection()
+        _check_external_changes(connection)
+        with connection:
+            connection.execute(
+                "INSERT INTO saved_items (kind, name, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (kind, name, json.dumps(data), now, now))
+        if kind in _cache:
+            _cache[kind][name] = data
+
+def delete_item(kind, name):
+    """
+    Delete one item. Returns True if it existed.
+    """
+    with _lock:
+        connection = _get_connection()
+        _check_external_changes(connection)
+        with connection:
+            deleted = connection.execute("DELETE FROM saved_items WHERE kind = ? AND name = ?", (kind, name)).rowcount
+        if kind in _cache:
+            _cache[kind].pop(name, None)
+        return deleted > 0
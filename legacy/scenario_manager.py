@@ -1,44 +1,25 @@
 # utils/scenario_manager.py
 
-import os
-import json
-import streamlit as st
+from legacy.saved_store import load_items, save_item, delete_item
 
-# Define a path for saving scenario data
+# Scenarios saved before the SQLite store are imported from this file on first load
 SCENARIOS_FILE_PATH = 'scenarios.json'
 
-@st.cache(allow_output_mutation=True)
 def load_scenarios():
     """
-    Load existing scenarios from a file.
+    Load existing scenarios from the store.
     """
-    if os.path.exists(SCENARIOS_FILE_PATH):
-        with open(SCENARIOS_FILE_PATH, 'r') as file:
-            scenarios = json.load(file)
-    else:
-        scenarios = {}
-    return scenarios
+    return load_items('scenario', SCENARIOS_FILE_PATH)
 
 def save_scenario(scenario_data):
     """
-    Save a new scenario to the file.
-    """
-    scenarios = load_scenarios()  # Load existing scenarios
-    scenario_name = scenario_data['name']
-    
-    # Add the new scenario to the scenarios dictionary
-    scenarios[scenario_name] = scenario_data
-    
-    # Write the updated scenarios back to the file
-    with open(SCENARIOS_FILE_PATH, 'w') as file:
-        json.dump(scenarios, file)
-    
-    # Clear the cache after updating the file
-    st.cache_data.clear()
+    Save a new scenario, replacing any scenario with the same name.
+    """
+    save_item('scenario', scenario_data['name'], scenario_data)
 
 def create_scenario(name, goal, challenges):
     """
-    Create a new scenario and add it to the scenarios file.
+    Create a new scenario and add it to the store.
     """
     scenario_data = {
         'name': name,
@@ -49,14 +30,7 @@ def create_scenario(name, goal, challenges):
 
 def delete_scenario(scenario_name):
     """
-    Delete a scenario and remove it from the scenarios file.
+    Delete a scenario from the store.
     Returns True if the scenario was successfully deleted.
     """
-    scenarios = load_scenarios()
-    if scenario_name in scenarios:
-        del scenarios[scenario_name]
-        with open(SCENARIOS_FILE_PATH, 'w') as file:
-            json.dump(scenarios, file)
-        st.cache_data.clear()
-        return True
-    return False
+    return delete_item('scenario', scenario_name)
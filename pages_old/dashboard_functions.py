@@ -1,14 +1,14 @@
 # utils/dashboard_functions.py
 import streamlit as st
-from utils.visualizer import draw_plot, load_excel_data
+import pandas as pd
+from utils.visualizer import draw_plot
 from utils.translator import translate
-
-excel_data_path = './data/business_analysis_data.xlsx'
+from utils.data_loader import load_business_data
 
 def show_main_dashboard(selected_startup, selected_indicators, target_language):
     st.title(translate(f"Dashboard for {selected_startup}", target_language))
 
-    dataframe = load_excel_data(excel_data_path)  # Load Excel data
+    dataframe = load_business_data().get('Sheet1', pd.DataFrame())  # Shared copy of the Excel data
 
     if 'display_states' not in st.session_state:
         st.session_state['display_states'] = {indicator: 'graph' for indicator in selected_indicators}
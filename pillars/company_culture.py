@@ -0,0 +1,57 @@
+# pillars/company_culture.py
+
+import streamlit as st
+from utils.translator import translate_many
+from utils.review_store import load_reviews
+from utils.topic_model import load_model, load_topic_aggregates, topic_words, create_topic_prevalence_chart
+from utils.employee_review_analysis import get_basic_statistics, create_rating_distribution_chart, generate_detailed_analysis, create_score_over_time_charts
+
+SCORE_COLUMNS = ["Work/Life Balance", "Diversity & Inclusion", "Career Opportunities", "Compensation and Benefits", "Senior Management"]
+
+def render(target_language):
+    """
+    Render the Company Culture Assessment pillar.
+    """
+    texts = translate_many(["Basic Statistics:", "Review Topics:", "Detailed Analysis:", "Refresh analysis",
+                            "Granularity", "Week", "Month", "Quarter",
+                            "Review data is missing. Please run the ingestion step first."], target_language)
+
+    # Reviews are ingested offline by `python -m utils.review_store`; pages only read the store
+    try:
+        review_data = load_reviews('Incredibuild')
+    except FileNotFoundError as e:
+        st.error(texts["Review data is missing. Please run the ingestion step first."])
+        print(e)
+        return
+    basic_stats = get_basic_statistics(review_data)
+    rating_dist_chart = create_rating_distribution_chart(review_data)
+
+    st.write(texts["Basic Statistics:"])
+    st.write(basic_stats)
+    # Displaying rating distribution chart
+    st.plotly_chart(rating_dist_chart)
+    # Displaying score over time charts; totals are kept per granularity and only new reviews are aggregated
+    granularity = st.radio(texts["Granularity"], ['week', 'month', 'quarter'], index=1, horizontal=True,
+                           format_func=lambda option: texts[option.capitalize()])
+    score_time_charts = create_score_over_time_charts(review_data, SCORE_COLUMNS, granularity, cache_key='Incredibuild')
+    for chart in score_time_charts:
+        st.plotly_chart(chart)
+    # Topic prevalence is precomputed by `python -m utils.topic_model`; skip the chart until it has run
+    try:
+        topic_aggregates = load_topic_aggregates()
+    except FileNotFoundError as e:
+        print(e)
+    else:
+        if 'Incredibuild' in topic_aggregates.index.get_level_values('company'):
+            labels = [', '.join(words[:3]) for words in topic_words(load_model())]
+            st.write(texts["Review Topics:"])
+            st.plotly_chart(create_topic_prevalence_chart(topic_aggregates, 'Incredibuild', labels))
+    st.write(texts["Detailed Analysis:"])
+    # Cached analyses are reused across reruns; the button forces new completions
+    refresh = st.button(texts["Refresh analysis"])
+    progress_bar = st.progress(0.0)
+    detailed_analysis = generate_detailed_analysis(
+        review_data, ["Company Culture"], progress_callback=lambda done, total: progress_bar.progress(done / total),
+        refresh=refresh)
+    progress_bar.empty()
+    st.write(detailed_analysis)
@@ -0,0 +1,55 @@
+# pillars/talent_excellence.py
+
+import streamlit as st
+from utils.translator import translate_many
+from utils.talent_aggregates import load_aggregate
+from utils.figure_builder import MAX_CATEGORIES, cached_figure
+from utils.talent_recruitment_analysis import (
+    attrition_and_headcount_from_cube, 
+    headcount_by_company_from_cube, 
+    create_company_headcount_chart, 
+    function_wise_attrition_from_cube, 
+    create_function_wise_chart, 
+    create_comparison_chart
+)
+
+def render(target_language):
+    """
+    Render the Talent Excellence and Recruitment pillar.
+    """
+    texts = translate_many([
+        "Talent aggregates are missing. Please run the build step first.",
+    ], target_language)
+
+    # Load the company x function x year cubes built offline by `python -m utils.talent_aggregates`;
+    # every chart below slices them
+    try:
+        incredibuild_cube = load_aggregate('incredibuild')
+        benchmark_cube = load_aggregate('benchmark')
+    except FileNotFoundError as e:
+        st.error(texts["Talent aggregates are missing. Please run the build step first."])
+        print(e)
+        return
+
+    # Compute attrition rates and headcount
+    incredibuild_attrition, incredibuild_headcount = attrition_and_headcount_from_cube(incredibuild_cube)
+    benchmark_attrition, _ = attrition_and_headcount_from_cube(benchmark_cube)
+    benchmark_headcounts = headcount_by_company_from_cube(benchmark_cube, top_n=MAX_CATEGORIES)
+
+    # Add Incredibuild's headcount to the benchmark_headcounts for comparison
+    benchmark_headcounts['Incredibuild'] = incredibuild_headcount
+
+    # Create and display comparison charts; figures are rebuilt only when their data changes
+    attrition_chart = cached_figure('attrition_comparison', create_comparison_chart, incredibuild_attrition, benchmark_attrition, 'Attrition Rate Comparison', 'Attrition Rate')
+    headcount_chart = cached_figure('company_headcount', create_company_headcount_chart, benchmark_headcounts, 'Company Headcount Comparison')
+    st.plotly_chart(attrition_chart)
+    st.plotly_chart(headcount_chart)
+
+    # Compute and display function-wise attrition charts
+    incredibuild_function_attrition = function_wise_attrition_from_cube(incredibuild_cube)
+    incredibuild_function_chart = cached_figure('function_wise', create_function_wise_chart, incredibuild_function_attrition, 'Incredibuild Function-Wise Attrition')
+    st.plotly_chart(incredibuild_function_chart)
+
+    benchmark_function_attrition = function_wise_attrition_from_cube(benchmark_cube, top_n=MAX_CATEGORIES)
+    benchmark_function_chart = cached_figure('function_wise', create_function_wise_chart, benchmark_function_attrition, 'Benchmark Function-Wise Attrition')
+    st.plotly_chart(benchmark_function_chart)
@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+class _CompletionStubHandler(BaseHTTPRequestHandler):
+    """
+    Local chat-completions endpoint. Answers with server.respond(request) and streams the
+    answer word by word as server-sent events when the request asks for a stream.
+    """
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        with self.server.lock:
+            self.server.requests.append(request)
+        content = self.server.respond(request)
+        if request.get('stream'):
+            self._stream(content)
+        else:
+            self._send_json({
+                'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': request['model'],
+                'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}],
+                'usage': {'prompt_tokens': 10, 'completion_tokens': 3, 'total_tokens': 13},
+            })
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, content):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        pieces = [word + ' ' for word in content.split(' ')]
+        pieces[-1] = pieces[-1][:-1]
+        try:
+            for piece in pieces:
+                self._event({'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]})
+                time.sleep(self.server.piece_delay)
+            self._event({'choices': [], 'usage': {'prompt_tokens': 10, 'completion_tokens': len(pieces), 'total_tokens': 10 + len(pieces)}})
+            self.wfile.write(b'data: [DONE]\n\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _event(self, chunk):
+        chunk = dict(chunk, id='stub', object='chat.completion.chunk', created=0, model='stub')
+        self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def completion_stub(monkeypatch, tmp_path):
+    """
+    Point the LLM gateway at a local completions stub and the completion cache at tmp_path.
+    Set stub.respond to change the answers; stub.requests holds every request received.
+    """
+    from openai import AsyncOpenAI
+    from utils import llm_cache, llm_gateway
+    import asyncio
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CompletionStubHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.lock = threading.Lock()
+    server.piece_delay = 0.0
+    server.respond = lambda request: f"Answer to: {request['messages'][-1]['content'][:40]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+    def get_client():
+        if llm_gateway._client is None:
+            llm_gateway._semaphore = asyncio.Semaphore(llm_gateway.MAX_CONCURRENCY)
+            llm_gateway._client = AsyncOpenAI(api_key='stub', base_url=base_url, max_retries=0)
+        return llm_gateway._client
+
+    monkeypatch.setattr(llm_gateway, '_client', None)
+    monkeypatch.setattr(llm_gateway, '_semaphore', None)
+    monkeypatch.setattr(llm_gateway, '_get_client', get_client)
+    monkeypatch.setattr(llm_gateway, 'REQUESTS_PER_SECOND', 1e9)
+    monkeypatch.setattr(llm_gateway, 'RATE_LIMIT_BURST', 1e9)
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_PATH', str(tmp_path / 'llm_completions.sqlite'))
+    monkeypatch.setattr(llm_cache, '_connection', None)
+    yield server
+    server.shutdown()
+    if llm_cache._connection is not None:
+        llm_cache._connection.close()
+
+class _TranslatorStub:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def translate(self, text):
+        self.calls.append(text)
+        return f'<{text}>'
+
+@pytest.fixture
+def translator_stub(monkeypatch, tmp_path):
+    """
+    Replace the network translator with a stub wrapping text in <>, and give the translator
+    empty catalogs and caches under tmp_path. Returns the list of texts sent to the stub.
+    """
+    from collections import OrderedDict
+    from utils import translator
+
+    calls = []
+    monkeypatch.setattr(translator, '_get_translator', lambda target_language: _TranslatorStub(calls))
+    monkeypatch.setattr(translator, 'TRANSLATION_DB_PATH', str(tmp_path / 'translations.sqlite'))
+    monkeypatch.setattr(translator, 'CATALOG_DIR', str(tmp_path / 'locales'))
+    monkeypatch.setattr(translator, '_connection', None)
+    monkeypatch.setattr(translator, '_catalogs', {})
+    monkeypatch.setattr(translator, '_memory_cache', OrderedDict())
+    monkeypatch.setattr(translator, '_stats', dict.fromkeys(translator._stats, 0))
+    yield calls
+    if translator._connection is not None:
+        translator._connection.close()
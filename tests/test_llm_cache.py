@@ -0,0 +1,76 @@
+import types
+import pytest
+from utils import llm_cache
+
+MESSAGES = [{'role': 'user', 'content': 'Summarize the reviews.'}]
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    """
+    Point the completion cache at tmp_path and give it a clock the test moves by hand.
+    """
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_PATH', str(tmp_path / 'llm_completions.sqlite'))
+    monkeypatch.setattr(llm_cache, '_connection', None)
+    monkeypatch.setattr(llm_cache, '_stats', dict.fromkeys(llm_cache._stats, 0))
+    monkeypatch.setattr(llm_cache, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    yield now
+    if llm_cache._connection is not None:
+        llm_cache._connection.close()
+
+def _completion(calls, response='summary'):
+    def create():
+        calls.append(response)
+        return response
+    return create
+
+def test_identical_requests_are_served_from_the_cache(clock):
+    calls = []
+    for _ in range(2):
+        assert llm_cache.cached_completion(_completion(calls), 'gpt-4', MESSAGES, 0.5, 500) == 'summary'
+    # Any change to the request is a different entry
+    llm_cache.cached_completion(_completion(calls), 'gpt-4', MESSAGES, 0.7, 500)
+    llm_cache.cached_completion(_completion(calls), 'gpt-3.5-turbo', MESSAGES, 0.5, 500)
+    assert len(calls) == 3
+    assert llm_cache.get_cache_stats() == {'hits': 1, 'misses': 3, 'refreshes': 0}
+
+def test_entries_expire_after_the_ttl(clock):
+    calls = []
+    llm_cache.cached_completion(_completion(calls), 'gpt-4', MESSAGES, 0.5, 500)
+    clock[0] += llm_cache.LLM_CACHE_TTL_SECONDS - 1
+    llm_cache.cached_completion(_completion(calls), 'gpt-4', MESSAGES, 0.5, 500)
+    assert len(calls) == 1
+    # Reading an entry does not extend its lifetime
+    clock[0] += 2
+    llm_cache.cached_completion(_completion(calls), 'gpt-4', MESSAGES, 0.5, 500)
+    assert len(calls) == 2
+
+def test_least_recently_used_entries_are_evicted_past_the_size_limit(clock, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_MAX_BYTES', 250)
+    keys = [llm_cache.completion_key('gpt-4', [{'role': 'user', 'content': str(i)}], 0.5, 500) for i in range(3)]
+    for i, key in enumerate(keys):
+        clock[0] += 1
+        llm_cache.store_completion(key, 'gpt-4', str(i) * 100)
+    # The first entry was evicted when the third pushed the total past the limit
+    assert llm_cache.get_completion(keys[0]) is None
+    clock[0] += 1
+    assert llm_cache.get_completion(keys[1]) == '1' * 100
+    clock[0] += 1
+    llm_cache.store_completion(keys[0], 'gpt-4', '0' * 100)
+    # Reading keys[1] made keys[2] the least recently used
+    assert llm_cache.get_completion(keys[2]) is None
+    assert llm_cache.get_completion(keys[1]) == '1' * 100
+
+def test_refresh_skips_the_lookup_and_overwrites_the_entry(clock):
+    calls = []
+    llm_cache.cached_completion(_completion(calls, 'old'), 'gpt-4', MESSAGES, 0.5, 500)
+    assert llm_cache.cached_completion(_completion(calls, 'new'), 'gpt-4', MESSAGES, 0.5, 500, refresh=True) == 'new'
+    assert llm_cache.cached_completion(_completion(calls, 'other'), 'gpt-4', MESSAGES, 0.5, 500) == 'new'
+    assert calls == ['old', 'new']
+    assert llm_cache.get_cache_stats() == {'hits': 1, 'misses': 1, 'refreshes': 1}
+
+def test_empty_completions_are_not_cached(clock):
+    calls = []
+    llm_cache.cached_completion(_completion(calls, ''), 'gpt-4', MESSAGES, 0.5, 500)
+    llm_cache.cached_completion(_completion(calls, ''), 'gpt-4', MESSAGES, 0.5, 500)
+    assert len(calls) == 2
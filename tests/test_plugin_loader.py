@@ -0,0 +1,17 @@
+from utils import plugin_loader
+
+def test_startup_modules_follow_the_entry_scripts_imports(tmp_path):
+    script = tmp_path / 'Hello.py'
+    script.write_text(
+        "import streamlit as st\n"
+        "import os, json\n"
+        "from utils.translator import translate_many\n"
+        "from utils.translator import translate\n"
+        "from . import sibling\n"
+        "def main():\n"
+        "    from utils.review_store import load_reviews\n")
+    assert plugin_loader.get_startup_modules(str(script)) == ['streamlit', 'os', 'json', 'utils.translator']
+
+def test_startup_modules_include_every_import_of_hello():
+    modules = plugin_loader.get_startup_modules()
+    assert {'streamlit', 'utils.translator', 'utils.plugin_loader', 'utils.tracing'} <= set(modules)
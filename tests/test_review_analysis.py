@@ -0,0 +1,81 @@
+import re
+import time
+import pandas as pd
+from utils.employee_review_analysis import chunk_reviews, estimate_tokens, generate_detailed_analysis, merge_summaries
+
+TOPICS = ['Company Culture']
+
+def _reviews(count, words=30):
+    return pd.DataFrame({
+        'Pros': [f'review {i} ' + 'good ' * words for i in range(count)],
+        'Cons': [f'issue {i}' for i in range(count)],
+    })
+
+def _user_prompt(request):
+    return request['messages'][-1]['content']
+
+def test_chunk_reviews_keeps_order_within_budget():
+    reviews = [f'review {i} ' + 'x' * (40 + 10 * (i % 7)) for i in range(50)]
+    chunks = chunk_reviews(reviews, token_budget=100)
+    assert [review for chunk in chunks for review in chunk] == reviews
+    assert all(sum(estimate_tokens(review) for review in chunk) <= 100 for chunk in chunks)
+    # A chunk is only closed when the next review would not fit
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        assert sum(estimate_tokens(review) for review in chunk) + estimate_tokens(next_chunk[0]) > 100
+
+def test_chunk_reviews_truncates_oversized_reviews():
+    chunks = chunk_reviews(['short', 'y' * 2000, 'tail'], token_budget=100)
+    assert chunks == [['short'], ['y' * 400], ['tail']]
+
+def test_single_chunk_is_analyzed_in_one_call(completion_stub):
+    progress = []
+    analysis = generate_detailed_analysis(_reviews(3), TOPICS, progress_callback=lambda done, total: progress.append((done, total)))
+    assert len(completion_stub.requests) == 1
+    assert analysis.startswith('Answer to: Analyze these employee reviews')
+    assert progress == [(1, 1)]
+
+def test_map_reduce_keeps_chunk_order_and_reports_progress(completion_stub):
+    def respond(request):
+        prompt = _user_prompt(request)
+        match = re.search(r'review (\d+) ', prompt)
+        if prompt.startswith('Analyze') and match:
+            # Later chunks answer first, so as_completed returns them out of order
+            first_review = int(match.group(1))
+            time.sleep(max(0.0, 0.3 - first_review * 0.01))
+            return f'summary from review {first_review}'
+        return 'merged analysis'
+    completion_stub.respond = respond
+
+    progress = []
+    reviews = _reviews(30)
+    analysis = generate_detailed_analysis(reviews, TOPICS, token_budget=200, max_workers=8,
+                                          progress_callback=lambda done, total: progress.append((done, total)))
+    map_calls = [request for request in completion_stub.requests if _user_prompt(request).startswith('Analyze')]
+    merge_calls = [request for request in completion_stub.requests if _user_prompt(request).startswith('These are partial')]
+    assert analysis == 'merged analysis'
+    assert len(map_calls) > 1 and len(merge_calls) == 1
+    total = len(map_calls) + 1
+    assert progress == [(done, total) for done in range(1, total + 1)]
+    # Partial summaries reach the merge in chunk order, whatever order they completed in
+    first_reviews = [int(number) for number in re.findall(r'summary from review (\d+)', _user_prompt(merge_calls[0]))]
+    assert first_reviews == sorted(first_reviews) and len(first_reviews) == len(map_calls)
+
+def test_merge_summaries_falls_back_to_pairs(completion_stub):
+    completion_stub.respond = lambda request: 'merged'
+    # Every summary fills most of the budget, so no two fit in one prompt
+    summaries = [f'summary {i} ' + 'z' * 300 for i in range(4)]
+    assert merge_summaries(summaries, TOPICS, token_budget=100) == 'merged'
+    prompts = [_user_prompt(request) for request in completion_stub.requests]
+    assert len(prompts) == 3
+    assert [prompt.count('Partial summary') for prompt in prompts] == [2, 2, 2]
+    assert 'summary 0 ' in prompts[0] and 'summary 1 ' in prompts[0]
+    assert 'summary 2 ' in prompts[1] and 'summary 3 ' in prompts[1]
+
+def test_rerun_is_served_from_the_completion_cache(completion_stub):
+    reviews = _reviews(30)
+    first = generate_detailed_analysis(reviews, TOPICS, token_budget=200)
+    calls = len(completion_stub.requests)
+    assert generate_detailed_analysis(reviews, TOPICS, token_budget=200) == first
+    assert len(completion_stub.requests) == calls
+    generate_detailed_analysis(reviews, TOPICS, token_budget=200, refresh=True)
+    assert len(completion_stub.requests) == 2 * calls
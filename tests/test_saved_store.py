@@ -0,0 +1,81 @@
+import json
+import sqlite3
+import pytest
+from legacy import saved_store
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(saved_store, 'SAVED_STORE_PATH', str(tmp_path / 'saved_items.sqlite'))
+    monkeypatch.setattr(saved_store, '_connection', None)
+    monkeypatch.setattr(saved_store, '_cache', {})
+    monkeypatch.setattr(saved_store, '_data_version', None)
+    yield tmp_path
+    _restart()
+
+def _restart():
+    """
+    Drop the connection and the in-process cache, as a server restart would.
+    """
+    if saved_store._connection is not None:
+        saved_store._connection.close()
+    saved_store._connection = None
+    saved_store._cache.clear()
+    saved_store._data_version = None
+
+def _legacy_json(tmp_path, items):
+    json_path = tmp_path / 'saved_queries.json'
+    json_path.write_text(json.dumps(items))
+    return str(json_path)
+
+def test_legacy_json_is_imported_once_in_order(store):
+    json_path = _legacy_json(store, {'b': {'query': 2}, 'a': {'query': 1}})
+    assert saved_store.load_items('queries', json_path) == {'b': {'query': 2}, 'a': {'query': 1}}
+    # The JSON file is no longer read once it has been imported
+    _legacy_json(store, {'c': {'query': 3}})
+    _restart()
+    assert list(saved_store.load_items('queries', json_path)) == ['b', 'a']
+
+def test_deleted_item_stays_deleted_after_restart(store):
+    json_path = _legacy_json(store, {'a': {'query': 1}, 'b': {'query': 2}})
+    saved_store.load_items('queries', json_path)
+    assert saved_store.delete_item('queries', 'a')
+    assert not saved_store.delete_item('queries', 'a')
+    _restart()
+    assert saved_store.load_items('queries', json_path) == {'b': {'query': 2}}
+    # Deleting every item does not bring the JSON items back either
+    saved_store.delete_item('queries', 'b')
+    _restart()
+    assert saved_store.load_items('queries', json_path) == {}
+
+def test_writes_from_another_connection_invalidate_the_cache(store):
+    saved_store.save_item('scenarios', 'base', {'growth': 1})
+    assert saved_store.load_items('scenarios') == {'base': {'growth': 1}}
+
+    other = sqlite3.connect(saved_store.SAVED_STORE_PATH)
+    with other:
+        other.execute("INSERT INTO saved_items (kind, name, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                      ('scenarios', 'other', json.dumps({'growth': 2}), 2e9, 2e9))
+    other.close()
+    assert saved_store.load_items('scenarios') == {'base': {'growth': 1}, 'other': {'growth': 2}}
+
+def test_own_writes_update_the_cache_without_a_reload(store, monkeypatch):
+    saved_store.load_items('scenarios')
+    saved_store.save_item('scenarios', 'base', {'growth': 1})
+    monkeypatch.setattr(saved_store, '_import_json', lambda *args: pytest.fail('cache was reloaded'))
+    assert saved_store.load_items('scenarios') == {'base': {'growth': 1}}
+
+def test_save_replaces_by_kind_and_name_and_keeps_created_at(store):
+    saved_store.save_item('queries', 'first', {'version': 1})
+    saved_store.save_item('queries', 'second', {'version': 1})
+    saved_store.save_item('scenarios', 'first', {'version': 1})
+    created_at = saved_store._connection.execute(
+        "SELECT created_at FROM saved_items WHERE kind = 'queries' AND name = 'first'").fetchone()[0]
+
+    saved_store.save_item('queries', 'first', {'version': 2})
+    row = saved_store._connection.execute(
+        "SELECT created_at, updated_at FROM saved_items WHERE kind = 'queries' AND name = 'first'").fetchone()
+    assert row[0] == created_at and row[1] > created_at
+    _restart()
+    # The replaced item keeps its place, and other kinds are untouched
+    assert saved_store.load_items('queries') == {'first': {'version': 2}, 'second': {'version': 1}}
+    assert saved_store.load_items('scenarios') == {'first': {'version': 1}}
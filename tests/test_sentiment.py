@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from utils import sentiment
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(sentiment, 'SENTIMENT_CACHE_PATH', str(tmp_path / 'sentiment.sqlite'))
+    monkeypatch.setattr(sentiment, '_connection', None)
+    monkeypatch.setattr(sentiment, '_stats', dict.fromkeys(sentiment._stats, 0))
+    yield
+    if sentiment._connection is not None:
+        sentiment._connection.close()
+
+class _RecordingPool:
+    """
+    Stands in for ProcessPoolExecutor, scoring the chunks in process.
+    """
+    created = []
+
+    def __init__(self, max_workers, mp_context):
+        self.chunk_sizes = []
+        _RecordingPool.created.append((self, max_workers, mp_context.get_start_method()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def map(self, function, chunks):
+        self.chunk_sizes = [len(chunk) for chunk in chunks]
+        return map(function, chunks)
+
+@pytest.fixture
+def pool(monkeypatch):
+    _RecordingPool.created = []
+    monkeypatch.setattr(sentiment, 'ProcessPoolExecutor', _RecordingPool)
+    return _RecordingPool.created
+
+def test_scores_match_textblob_and_blanks_score_zero(cache):
+    from textblob import TextBlob
+    texts = ['Great people and culture', 'Terrible management', None, '  ', 'Great people and culture']
+    scores = sentiment.score_texts(texts, max_workers=1)
+    assert scores[0] == scores[4] == TextBlob('Great people and culture').sentiment.polarity
+    assert scores[1] == TextBlob('Terrible management').sentiment.polarity
+    assert scores[2:4] == [0.0, 0.0]
+    # Duplicates and blanks are not scored
+    assert sentiment.get_cache_stats() == {'hits': 0, 'scored': 2}
+
+def test_only_new_texts_are_scored(cache, monkeypatch):
+    sentiment.score_texts(['Good pay', 'Long hours'], max_workers=1)
+    scored = []
+    monkeypatch.setattr(sentiment, '_score_chunk', lambda texts: scored.extend(texts) or [0.5] * len(texts))
+    assert sentiment.score_texts(['Long hours', 'Nice office', 'Good pay'], max_workers=1)[1] == 0.5
+    assert scored == ['Nice office']
+    assert sentiment.get_cache_stats() == {'hits': 2, 'scored': 3}
+
+def test_scorer_version_is_part_of_the_key(cache, monkeypatch):
+    assert sentiment._text_key('Good pay') != sentiment._text_key('Good pay ')
+    sentiment.score_texts(['Good pay'], max_workers=1)
+    monkeypatch.setattr(sentiment, 'SCORER_VERSION', 'textblob-polarity-2')
+    sentiment.score_texts(['Good pay'], max_workers=1)
+    assert sentiment.get_cache_stats() == {'hits': 0, 'scored': 2}
+
+def test_process_pool_starts_at_min_parallel_texts(cache, pool):
+    texts = [f'review number {i}' for i in range(sentiment.MIN_PARALLEL_TEXTS)]
+    sentiment.score_texts(texts[:-1], max_workers=4)
+    assert pool == []
+    # Only the one uncached text is left, so the pool is still not worth starting
+    sentiment.score_texts(texts, max_workers=4)
+    assert pool == []
+
+    more = [f'another review {i}' for i in range(sentiment.MIN_PARALLEL_TEXTS)]
+    scores = sentiment.score_texts(more, max_workers=4, chunk_size=300)
+    (instance, max_workers, start_method), = pool
+    assert (max_workers, start_method) == (4, 'spawn')
+    assert instance.chunk_sizes == [300, 300, 300, 100]
+    assert len(scores) == len(more)
+
+def test_single_worker_never_starts_a_pool(cache, pool):
+    sentiment.score_texts([f'review number {i}' for i in range(sentiment.MIN_PARALLEL_TEXTS)], max_workers=1)
+    assert pool == []
+
+def test_process_pool_scores_like_the_serial_path(cache, monkeypatch):
+    monkeypatch.setattr(sentiment, 'MIN_PARALLEL_TEXTS', 4)
+    texts = ['Great people', 'Bad management', 'Okay benefits', 'Awful commute', 'Nice office']
+    parallel = sentiment.score_texts(texts, max_workers=2, chunk_size=2)
+    assert parallel == sentiment._score_chunk(texts)
+
+def test_score_reviews_adds_a_polarity_column_per_text_column(cache):
+    df = pd.DataFrame({'Pros': ['Great people', None], 'Cons': ['Bad management', 'Great people']})
+    scored = sentiment.score_reviews(df, ['Pros', 'Cons'], max_workers=1)
+    assert scored['Pros_polarity'].tolist() == sentiment.score_texts(['Great people', None], max_workers=1)
+    assert scored['Cons_polarity'].iloc[1] == scored['Pros_polarity'].iloc[0]
+    assert 'Pros_polarity' not in df
@@ -0,0 +1,50 @@
+import time
+import openai
+import pytest
+from utils import llm_gateway
+from utils.translator import translate_stream
+
+MESSAGES = [{'role': 'user', 'content': 'Interpret the indicators.'}]
+
+def test_stream_yields_pieces_as_they_arrive(completion_stub):
+    completion_stub.respond = lambda request: 'Prices rose. Demand fell.'
+    pieces = list(llm_gateway.stream(MESSAGES, 'gpt-3.5-turbo'))
+    assert len(pieces) > 1
+    assert ''.join(pieces) == 'Prices rose. Demand fell.'
+    assert completion_stub.requests[0]['stream'] is True
+
+def test_stream_raises_errors_in_the_caller(completion_stub, monkeypatch):
+    monkeypatch.setattr(llm_gateway, 'MAX_RETRIES', 0)
+    completion_stub.shutdown()
+    completion_stub.server_close()
+    with pytest.raises(openai.APIConnectionError):
+        list(llm_gateway.stream(MESSAGES, 'gpt-3.5-turbo', deadline=5))
+
+def test_closing_a_stream_frees_its_concurrency_slot(completion_stub):
+    completion_stub.respond = lambda request: ' '.join(['word'] * 200)
+    completion_stub.piece_delay = 0.05
+    pieces = llm_gateway.stream(MESSAGES, 'gpt-3.5-turbo')
+    next(pieces)
+    assert llm_gateway._semaphore._value == llm_gateway.MAX_CONCURRENCY - 1
+    pieces.close()
+    deadline = time.monotonic() + 2
+    while llm_gateway._semaphore._value < llm_gateway.MAX_CONCURRENCY and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert llm_gateway._semaphore._value == llm_gateway.MAX_CONCURRENCY
+
+def test_translate_stream_translates_complete_sentences(translator_stub):
+    pieces = ['Prices ro', 'se. Dem', 'and fell!  Next', ' line\n\nLast fragment']
+    assert list(translate_stream(pieces, 'iw')) == [
+        '<Prices rose.> ', '<Demand fell!>  ', '<Next line>\n\n', '<Last fragment>']
+    assert translator_stub == ['Prices rose.', 'Demand fell!', 'Next line', 'Last fragment']
+
+def test_translate_stream_waits_for_sentence_boundaries(translator_stub):
+    stream = translate_stream(iter(['One', ' sentence', ' in pieces.', ' Two']), 'iw')
+    assert next(stream) == '<One sentence in pieces.> '
+    assert translator_stub == ['One sentence in pieces.']
+    assert list(stream) == ['<Two>']
+
+def test_translate_stream_passes_english_through(translator_stub):
+    pieces = ['Prices ro', 'se. Dem', 'and fell.']
+    assert list(translate_stream(pieces, 'en')) == pieces
+    assert translator_stub == []
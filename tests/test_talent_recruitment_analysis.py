@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.profile_generator import generate_profiles
+from utils.talent_recruitment_analysis import (
+    CUBE_DIMENSIONS, compute_attrition_cube, compute_attrition_cube_chunked, parse_profiles,
+)
+
+DIMENSION_SETS = [CUBE_DIMENSIONS, ['company'], ['odp_function', 'country'], []]
+
+def _assert_chunked_matches(path, dimensions, chunk_rows, **options):
+    expected = compute_attrition_cube(parse_profiles(path, **options), dimensions)
+    actual = compute_attrition_cube_chunked(path, dimensions, chunk_rows=chunk_rows, **options)
+    pd.testing.assert_frame_equal(actual, expected)
+
+@pytest.fixture(scope='module')
+def profiles_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('profiles') / 'profiles.csv'
+    generate_profiles(path, 3000, seed=1, chunk_profiles=1000)
+    # Blank fields and terminations before the start, as in real extracts
+    data = pd.read_csv(path, sep=';', dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(0)
+    for column in ['company', 'odp_function', 'start_date', 'end_date']:
+        data.loc[rng.random(len(data)) < 0.02, column] = ''
+    data.loc[rng.random(len(data)) < 0.01, 'end_date'] = '01/01/1990'
+    data.to_csv(path, sep=';', index=False)
+    return path
+
+@pytest.mark.parametrize('dimensions', DIMENSION_SETS)
+@pytest.mark.parametrize('chunk_rows', [500, 10 ** 7])
+def test_chunked_cube_matches_in_memory(profiles_path, dimensions, chunk_rows):
+    _assert_chunked_matches(profiles_path, dimensions, chunk_rows, dayfirst=True)
+
+def test_chunked_cube_matches_with_explicit_date_format(profiles_path):
+    _assert_chunked_matches(profiles_path, CUBE_DIMENSIONS, 700, date_format='%d/%m/%Y')
+
+def test_chunked_cube_matches_with_numeric_dimensions(tmp_path):
+    path = tmp_path / 'numeric.csv'
+    pd.DataFrame({
+        'start_date': ['01/02/2019', '15/06/2020', '01/01/2021', '03/03/2021'],
+        'end_date': ['01/02/2021', '', '', '04/04/2022'],
+        'company': [1, 2, 1, 3],
+        'odp_function': [10, 10, 20, 20],
+    }).to_csv(path, sep=';', index=False)
+    for dimensions in DIMENSION_SETS[:2]:
+        _assert_chunked_matches(path, dimensions, 1, dayfirst=True)
+
+def test_chunked_cube_infers_date_format_once_per_column(tmp_path):
+    # The first chunk has no dates at all, and later chunks hold ISO and day-first values;
+    # the whole-file read infers one format per column from its first value
+    path = tmp_path / 'dates.csv'
+    pd.DataFrame({
+        'start_date': ['', '', '2019-02-01', '01/06/2020', '2021-12-05', '13/01/2021'],
+        'end_date': ['', '', '', '', '05/02/2022', '2023-01-01'],
+        'company': ['A', 'B', 'A', 'B', 'A', 'B'],
+        'odp_function': ['F', 'F', 'G', 'G', 'F', 'G'],
+    }).to_csv(path, sep=';', index=False)
+    for chunk_rows in [1, 2, 3, 100]:
+        _assert_chunked_matches(path, CUBE_DIMENSIONS, chunk_rows, dayfirst=True)
+
+def test_chunked_cube_of_empty_file(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('profile_id;start_date;end_date;company;odp_function\n')
+    assert compute_attrition_cube_chunked(path).empty
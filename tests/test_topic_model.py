@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from utils import review_store, topic_model
+
+PAY = 'salary bonus compensation raise equity benefits'.split()
+LEADERSHIP = 'manager leadership director executive decisions strategy'.split()
+
+def _reviews(count, start=0, company='Acme'):
+    rng = np.random.default_rng(start)
+    rows = []
+    for i in range(start, start + count):
+        words = rng.choice(PAY if i % 2 else LEADERSHIP, 12)
+        rows.append({'review_key': f'{company}-{i}', 'company': company, 'Month_Year': f'2024-{i % 12 + 1:02d}',
+                     'Pros': ' '.join(words), 'Cons': 'none'})
+    return pd.DataFrame(rows)
+
+def _doc_topics(model_dir):
+    return pd.read_parquet(os.path.join(model_dir, 'doc_topics.parquet'))
+
+def test_incremental_update_only_adds_new_reviews(tmp_path):
+    first, corpus = _reviews(300), pd.concat([_reviews(300), _reviews(300, start=300)], ignore_index=True)
+    assert topic_model.update_from_reviews(first, model_dir=tmp_path) == 300
+    before = _doc_topics(tmp_path)
+    iterations = topic_model.load_model(tmp_path)['lda'].n_batch_iter_
+
+    assert topic_model.update_from_reviews(corpus, model_dir=tmp_path) == 300
+    after = _doc_topics(tmp_path)
+    model = topic_model.load_model(tmp_path)
+    # Earlier mixtures are kept, and the learning rate schedule continues where it stopped
+    pd.testing.assert_frame_equal(after.iloc[:300], before)
+    assert after['review_key'].tolist() == corpus['review_key'].tolist()
+    assert model['lda'].n_batch_iter_ > iterations
+    # Each batch is scaled to the whole corpus, not to the reviews seen so far
+    assert model['lda'].total_samples == len(corpus)
+    np.testing.assert_allclose(after[[f'topic_{topic}' for topic in range(topic_model.NUM_TOPICS)]].sum(axis=1), 1.0)
+    assert topic_model.load_topic_aggregates(tmp_path)['reviews'].sum() == len(corpus)
+
+def test_rerun_without_new_reviews_leaves_the_model_unchanged(tmp_path):
+    corpus = _reviews(300)
+    topic_model.update_from_reviews(corpus, model_dir=tmp_path)
+    components = topic_model.load_model(tmp_path)['lda'].components_.copy()
+    assert topic_model.update_from_reviews(corpus, model_dir=tmp_path) == 0
+    np.testing.assert_array_equal(topic_model.load_model(tmp_path)['lda'].components_, components)
+
+def test_incremental_training_is_deterministic(tmp_path):
+    for run in ('a', 'b'):
+        topic_model.update_from_reviews(_reviews(300), model_dir=tmp_path / run)
+        topic_model.update_from_reviews(pd.concat([_reviews(300), _reviews(300, start=300)]), model_dir=tmp_path / run)
+    np.testing.assert_allclose(topic_model.load_model(tmp_path / 'a')['lda'].components_,
+                               topic_model.load_model(tmp_path / 'b')['lda'].components_)
+    assert topic_model.topic_words(topic_model.load_model(tmp_path / 'a'), 3) == \
+        topic_model.topic_words(topic_model.load_model(tmp_path / 'b'), 3)
+
+def test_untrained_model_has_no_topic_words(tmp_path):
+    assert topic_model.topic_words(topic_model.load_model(tmp_path)) == [[]] * topic_model.NUM_TOPICS
+    with pytest.raises(FileNotFoundError):
+        topic_model.load_topic_aggregates(tmp_path)
+
+def _run_main(monkeypatch, model_dir, *args):
+    monkeypatch.setattr(sys, 'argv', ['topic_model', '--output', str(model_dir), *args])
+    topic_model.main()
+
+def test_reset_retrains_from_scratch(tmp_path, monkeypatch):
+    reviews = {'Acme': _reviews(200), 'Globex': _reviews(100, company='Globex')}
+    monkeypatch.setattr(review_store, 'REVIEW_SOURCES', dict.fromkeys(reviews, 'unused'))
+    monkeypatch.setattr(review_store, 'load_reviews', lambda company: reviews[company])
+
+    _run_main(monkeypatch, tmp_path / 'reset')
+    reviews['Acme'] = pd.concat([reviews['Acme'], _reviews(100, start=200)], ignore_index=True)
+    _run_main(monkeypatch, tmp_path / 'reset')
+    _run_main(monkeypatch, tmp_path / 'reset', '--reset')
+    _run_main(monkeypatch, tmp_path / 'fresh')
+
+    fresh, reset = topic_model.load_model(tmp_path / 'fresh'), topic_model.load_model(tmp_path / 'reset')
+    assert reset['lda'].n_batch_iter_ == fresh['lda'].n_batch_iter_
+    np.testing.assert_allclose(reset['lda'].components_, fresh['lda'].components_)
+    assert reset['words'] == fresh['words']
+    doc_topics = _doc_topics(tmp_path / 'reset')
+    assert len(doc_topics) == 400 and doc_topics['review_key'].is_unique
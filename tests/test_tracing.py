@@ -0,0 +1,79 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils import tracing, translator
+
+def _names(trace):
+    return [item['name'] for item in trace['spans']]
+
+def test_spans_nest_and_join_the_callers_trace_from_worker_threads():
+    @tracing.traced
+    def work(label):
+        return label
+
+    trace = tracing.start_trace()
+    with tracing.span('page'):
+        work('main')
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(work, 'untraced').result()
+            tracing.submit_in_context(executor, work, 'traced').result()
+    tracing.finish_trace(trace)
+    assert [(item['name'], item['depth'], item['args']) for item in trace['spans']] == [
+        ('test_tracing.work', 1, {'args': ['main']}), ('test_tracing.work', 1, {'args': ['traced']}), ('page', 0, {})]
+
+def test_spans_finishing_after_the_trace_are_dropped():
+    started, release = threading.Event(), threading.Event()
+
+    @tracing.traced
+    def background():
+        started.set()
+        release.wait(5)
+
+    trace = tracing.start_trace()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = tracing.submit_in_context(executor, background)
+        started.wait(5)
+        tracing.finish_trace(trace)
+        release.set()
+        future.result()
+    assert trace['spans'] == []
+    assert tracing._current.get() is None
+
+def test_shared_translation_is_not_recorded_in_any_session_trace(translator_stub, monkeypatch):
+    release = threading.Event()
+    submitted = threading.Semaphore(0)
+    submit = translator._submit
+
+    class SlowTranslator:
+        def translate(self, text):
+            release.wait(5)
+            translator_stub.append(text)
+            return f'<{text}>'
+
+    def counting_submit(*args):
+        future = submit(*args)
+        submitted.release()
+        return future
+    monkeypatch.setattr(translator, '_get_translator', lambda target_language: SlowTranslator())
+    monkeypatch.setattr(translator, '_submit', counting_submit)
+
+    def session(results):
+        trace = tracing.start_trace()
+        results['translations'] = translator.translate_many(['Hello'], 'iw', latency_budget=5)
+        results['trace'] = tracing.finish_trace(trace)
+
+    sessions = [{}, {}]
+    threads = [threading.Thread(target=contextvars.Context().run, args=(session, results)) for results in sessions]
+    for thread in threads:
+        thread.start()
+    # Both sessions wait on the same in-flight request before it completes
+    for _ in threads:
+        assert submitted.acquire(timeout=5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert translator_stub == ['Hello']
+    for results in sessions:
+        assert results['translations'] == {'Hello': '<Hello>'}
+        assert _names(results['trace']) == ['translator.wait_online', 'translator.translate_many']
@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+import time
+from utils import translator
+
+def _write_catalog(strings, target_language='iw'):
+    os.makedirs(translator.CATALOG_DIR, exist_ok=True)
+    with open(translator.catalog_path(target_language), 'w', encoding='utf-8') as file:
+        json.dump({'strings': strings}, file)
+
+def test_catalog_is_checked_first(translator_stub):
+    _write_catalog({'Basic Statistics:': 'catalog'})
+    assert translator.translate('Basic Statistics:', 'iw') == 'catalog'
+    assert translator_stub == []
+    assert translator.get_cache_stats() == {'catalog_hits': 1, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'errors': 0}
+
+def test_lookup_falls_through_memory_then_disk_then_network(translator_stub):
+    assert translator.translate('Hello', 'iw') == '<Hello>'
+    assert translator.translate('Hello', 'iw') == '<Hello>'
+    translator._memory_cache.clear()
+    assert translator.translate('Hello', 'iw') == '<Hello>'
+    assert translator.translate('Hello', 'iw') == '<Hello>'
+    # The same text in another language is a separate entry
+    assert translator.translate('Hello', 'de') == '<Hello>'
+    assert translator_stub == ['Hello', 'Hello']
+    assert translator.get_cache_stats() == {'catalog_hits': 0, 'memory_hits': 2, 'disk_hits': 1, 'misses': 2, 'errors': 0}
+
+def test_memory_cache_evicts_least_recently_used(translator_stub, monkeypatch):
+    monkeypatch.setattr(translator, 'MEMORY_CACHE_SIZE', 2)
+    for text in ('one', 'two', 'one', 'three'):
+        translator.translate(text, 'iw')
+    assert [key for key in translator._memory_cache] == [translator._cache_key(text, 'iw') for text in ('one', 'three')]
+    translator.translate('two', 'iw')
+    assert translator.get_cache_stats()['disk_hits'] == 1
+
+def test_failed_translations_fall_back_to_english_and_are_not_cached(translator_stub, monkeypatch):
+    class FailingTranslator:
+        def translate(self, text):
+            raise ConnectionError('offline')
+    monkeypatch.setattr(translator, '_get_translator', lambda target_language: FailingTranslator())
+    assert translator.translate('Hello', 'iw') == 'Hello'
+    assert translator.translate('Hello', 'iw') == 'Hello'
+    stats = translator.get_cache_stats()
+    assert stats['errors'] == 2 and stats['misses'] == 2
+    assert translator._memory_cache == {}
+
+def test_translate_many_shares_lookups_and_respects_the_latency_budget(translator_stub, monkeypatch):
+    _write_catalog({'Title': 'catalog'})
+    translator.translate('Cached', 'iw')
+    release = threading.Event()
+
+    class SlowTranslator:
+        def translate(self, text):
+            if text == 'Slow':
+                release.wait(5)
+            translator_stub.append(text)
+            return f'<{text}>'
+    monkeypatch.setattr(translator, '_get_translator', lambda target_language: SlowTranslator())
+
+    texts = ['Title', 'Cached', 'Fast', 'Slow', 'Fast', ' ']
+    assert translator.translate_many(texts, 'iw', latency_budget=0.5) == {
+        'Title': 'catalog', 'Cached': '<Cached>', 'Fast': '<Fast>', 'Slow': 'Slow', ' ': ' '}
+    # The pending translation keeps running and serves the next render
+    release.set()
+    deadline = time.monotonic() + 5
+    while translator._cache_key('Slow', 'iw') not in translator._memory_cache and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert translator.translate_many(['Slow'], 'iw') == {'Slow': '<Slow>'}
+    assert translator_stub == ['Cached', 'Fast', 'Slow']
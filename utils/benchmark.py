@@ -0,0 +1,250 @@
+# utils/benchmark.py
+#
+# Offline scaling benchmarks for the functions the dashboard depends on. Inputs are
+# synthetic (10k up to 10M rows), the network is replaced by local stubs, and every run
+# is appended to a history file. A benchmark fails when it is slower than the median of
+# its recent history on the same machine by more than the regression threshold.
+#
+# Usage: python -m utils.benchmark [--max-rows 1000000] [--only attrition] [--no-record]
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+
+BENCHMARK_HISTORY_PATH = './data/.cache/benchmark_history.jsonl'
+BENCHMARK_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_MAX_ROWS = 1_000_000
+# A run slower than (1 + threshold) x the recent median fails
+REGRESSION_THRESHOLD = 0.25
+# Past runs per benchmark and size making up the baseline
+BASELINE_RUNS = 5
+# Repetitions per measurement (the fastest counts); large inputs run once
+REPEATS = 3
+SINGLE_RUN_ROWS = 1_000_000
+SEED = 0
+
+SCORE_COLUMNS = ["Work/Life Balance", "Diversity & Inclusion", "Career Opportunities", "Compensation and Benefits", "Senior Management"]
+
+def synthetic_profiles(rows, companies=200, functions=12, seed=SEED):
+    """
+    Return rows profiles with the columns the attrition functions read: dates, company, function and country.
+    About a third of the positions are still open.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2000-01-01') + rng.integers(0, 24 * 365, rows).astype('timedelta64[D]')
+    tenure = rng.exponential(3 * 365, rows).astype('int64').astype('timedelta64[D]')
+    end = pd.Series(start + tenure).where(rng.random(rows) > 0.33)
+    return pd.DataFrame({
+        'start_date': pd.Series(start),
+        'end_date': end.fillna(pd.Timestamp('2025-01-01')),
+        'company': pd.Categorical.from_codes(rng.zipf(1.5, rows) % companies, [f'company_{i}' for i in range(companies)]),
+        'odp_function': pd.Categorical.from_codes(rng.integers(0, functions, rows), [f'function_{i}' for i in range(functions)]),
+        'country': pd.Categorical.from_codes(rng.integers(0, 20, rows), [f'country_{i}' for i in range(20)]),
+    })
+
+def synthetic_reviews(rows, seed=SEED):
+    """
+    Return rows reviews with a Date and the five score columns (some scores missing).
+    """
+    rng = np.random.default_rng(seed)
+    reviews = pd.DataFrame({'Date': pd.Series(np.datetime64('2015-01-01') + rng.integers(0, 9 * 365, rows).astype('timedelta64[D]'))})
+    for column in SCORE_COLUMNS:
+        reviews[column] = pd.Series(rng.integers(1, 6, rows).astype(float)).where(rng.random(rows) > 0.1)
+    reviews['Month_Year'] = reviews['Date'].dt.to_period('M')
+    return reviews
+
+class _CompletionStub(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the chat completions endpoint.
+    """
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({
+            'id': 'benchmark', 'object': 'chat.completion', 'created': 0, 'model': 'benchmark',
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': 'Benchmark response.'}}],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 3, 'total_tokens': 13},
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class _TranslatorStub:
+    def translate(self, text):
+        return text[::-1]
+
+def _use_local_stubs(work_dir):
+    """
+    Point the translator and the LLM gateway at local stubs, and their caches at work_dir.
+    """
+    from openai import AsyncOpenAI
+    from utils import llm_cache, llm_gateway, translator
+
+    translator.TRANSLATION_DB_PATH = os.path.join(work_dir, 'translations.sqlite')
+    translator._get_translator = lambda target_language: _TranslatorStub()
+    llm_cache.LLM_CACHE_PATH = os.path.join(work_dir, 'llm_completions.sqlite')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CompletionStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+    def get_client():
+        if llm_gateway._client is None:
+            llm_gateway._semaphore = asyncio.Semaphore(llm_gateway.MAX_CONCURRENCY)
+            llm_gateway._client = AsyncOpenAI(api_key='benchmark', base_url=base_url, max_retries=0)
+        return llm_gateway._client
+    llm_gateway._get_client = get_client
+    # Measure the call path, not the production rate limit
+    llm_gateway.REQUESTS_PER_SECOND = llm_gateway.RATE_LIMIT_BURST = 1e9
+    return server
+
+def _attrition_setup(function_name):
+    def setup(rows):
+        from utils import talent_recruitment_analysis
+        data = synthetic_profiles(rows)
+        return lambda: getattr(talent_recruitment_analysis, function_name)(data)
+    return setup
+
+def _score_charts_setup(rows):
+    from utils.employee_review_analysis import create_score_over_time_charts
+    reviews = synthetic_reviews(rows)
+    return lambda: create_score_over_time_charts(reviews, SCORE_COLUMNS)
+
+def _generate_data_setup(rows):
+    from legacy import data_generator
+    indicators = list(data_generator.INDICATOR_GENERATORS)
+
+    def run():
+        # Cold cache: every series is generated again
+        data_generator._generate_many.cache_clear()
+        for indicator in indicators:
+            data_generator.generate_data(indicator)
+    return run
+
+def _translate_setup(rows):
+    from utils.translator import translate
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        # Fresh strings, so every call misses both cache tiers and reaches the stub
+        run_id = next(counter)
+        for i in range(rows):
+            translate(f'Benchmark string {run_id}-{i}', 'iw')
+    return run
+
+def _model_response_setup(rows):
+    from utils.employee_review_analysis import get_model_response
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        # Fresh prompts, so every call misses the completion cache and reaches the stub
+        run_id = next(counter)
+        for i in range(rows):
+            get_model_response([{'role': 'user', 'content': f'Benchmark prompt {run_id}-{i}'}])
+    return run
+
+# Benchmark name -> (setup(rows) returning the timed callable, input sizes)
+BENCHMARKS = {
+    'compute_attrition_and_headcount': (_attrition_setup('compute_attrition_and_headcount'), BENCHMARK_SIZES),
+    'compute_headcount_by_company': (_attrition_setup('compute_headcount_by_company'), BENCHMARK_SIZES),
+    'compute_function_wise_attrition': (_attrition_setup('compute_function_wise_attrition'), BENCHMARK_SIZES),
+    'create_score_over_time_charts': (_score_charts_setup, BENCHMARK_SIZES),
+    # Fixed size: one cold pass over every indicator series
+    'generate_data': (_generate_data_setup, [1]),
+    'translate': (_translate_setup, [1_000, 10_000]),
+    'get_model_response': (_model_response_setup, [100]),
+}
+
+def machine_key():
+    return f'{platform.node()}|{platform.machine()}|{os.cpu_count()}|py{platform.python_version()}'
+
+def read_history(history_path=BENCHMARK_HISTORY_PATH):
+    try:
+        with open(history_path, 'r') as file:
+            return [json.loads(line) for line in file if line.strip()]
+    except OSError:
+        return []
+
+def baseline(history, name, rows, machine):
+    """
+    Return the median time of the last BASELINE_RUNS recorded runs of a benchmark, or None.
+    """
+    times = [entry['seconds'] for entry in history
+             if entry['benchmark'] == name and entry['rows'] == rows and entry['machine'] == machine]
+    return statistics.median(times[-BASELINE_RUNS:]) if times else None
+
+def measure(run, rows):
+    repeats = 1 if rows >= SINGLE_RUN_ROWS else REPEATS
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_benchmarks(names=None, max_rows=DEFAULT_MAX_ROWS, threshold=REGRESSION_THRESHOLD,
+                   history_path=BENCHMARK_HISTORY_PATH, record=True):
+    """
+    Run the selected benchmarks up to max_rows input rows.
+    Returns (results, regressions): one dict per measurement, and the measurements past the threshold.
+    """
+    history = read_history(history_path)
+    machine = machine_key()
+    results, regressions = [], []
+    with tempfile.TemporaryDirectory() as work_dir:
+        server = _use_local_stubs(work_dir)
+        try:
+            for name, (setup, sizes) in BENCHMARKS.items():
+                if names and name not in names:
+                    continue
+                for rows in [size for size in sizes if size <= max_rows]:
+                    seconds = measure(setup(rows), rows)
+                    reference = baseline(history, name, rows, machine)
+                    result = {'benchmark': name, 'rows': rows, 'seconds': seconds, 'baseline': reference,
+                              'machine': machine, 'timestamp': time.time()}
+                    results.append(result)
+                    regressed = reference is not None and seconds > reference * (1 + threshold)
+                    if regressed:
+                        regressions.append(result)
+                    change = f"{seconds / reference - 1:+.0%}" if reference else 'new'
+                    print(f"{name:36} {rows:>10,} rows {seconds:10.4f}s  {change}{'  REGRESSION' if regressed else ''}")
+        finally:
+            server.shutdown()
+
+    if record and results:
+        os.makedirs(os.path.dirname(history_path), exist_ok=True)
+        with open(history_path, 'a') as file:
+            for result in results:
+                file.write(json.dumps({key: value for key, value in result.items() if key != 'baseline'}) + '\n')
+    return results, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline scaling benchmarks.')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS, help='Largest input size to run, up to 10000000')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='Allowed slowdown versus the recent median')
+    parser.add_argument('--history', default=BENCHMARK_HISTORY_PATH, help='History file (JSON lines)')
+    parser.add_argument('--no-record', action='store_true', help='Do not append this run to the history')
+    args = parser.parse_args()
+
+    _, regressions = run_benchmarks(args.only, args.max_rows, args.threshold, args.history, not args.no_record)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,25 @@
 import pandas as pd
+from utils.data_registry import get_data
 
-# Function to load data
-file_path = './data/business_analysis_data.xlsx'  # Update with the actual path
+def load_workbook(file_path):
+    """
+    Load every sheet of an Excel workbook as {sheet name: DataFrame}.
+    """
+    return pd.read_excel(file_path, sheet_name=None)
+
+def load_business_data():
+    """
+    Return the shared business analysis workbook, or no sheets when it is missing or unreadable
+    so the dashboard renders empty instead of failing.
+    """
+    try:
+        return get_data('business_analysis')
+    except Exception as e:
+        print(f"Error loading Excel data: {e}")
+        return {}
 
 def get_sheet_names():
-    excel_data = pd.ExcelFile(file_path)
-    return excel_data.sheet_names
+    return list(load_business_data().keys())
 
 def load_data(sheet_name):
-    return pd.read_excel(file_path, sheet_name)
+    return load_business_data().get(sheet_name, pd.DataFrame())
@@ -0,0 +1,83 @@
+# utils/data_registry.py
+
+import importlib
+import threading
+from utils.config_loader import config
+from utils.parquet_cache import file_fingerprint
+from utils.tracing import traced
+
+# Loaded sources shared by every session in the process: name -> (fingerprint, data)
+_assets = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+def get_source(name):
+    """
+    Return the declaration of a data source from the [data_sources] section of config.toml.
+    """
+    try:
+        return config['data_sources'][name]
+    except KeyError:
+        raise KeyError(f"Unknown data source '{name}'. Declare it under [data_sources] in config.toml")
+
+def get_source_path(name):
+    return get_source(name)['path']
+
+def _resolve_loader(dotted_path):
+    # Loaders are imported on first use so a source's heavy dependencies load only when it is needed
+    module_name, _, function_name = dotted_path.rpartition('.')
+    return getattr(importlib.import_module(module_name), function_name)
+
+def validate_schema(name, data, schema):
+    """
+    Raise ValueError when a loaded frame (or any sheet of a workbook) misses a declared column.
+    """
+    frames = data.values() if isinstance(data, dict) else [data]
+    for frame in frames:
+        missing = [column for column in schema if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Data source '{name}' is missing columns: {', '.join(missing)}")
+
+@traced
+def load_source(name):
+    """
+    Load a data source from disk, bypassing the shared copy.
+    """
+    source = get_source(name)
+    data = _resolve_loader(source['loader'])(source['path'], **source.get('options', {}))
+    validate_schema(name, data, source.get('schema', []))
+    return data
+
+def _get_lock(name):
+    with _registry_lock:
+        return _locks.setdefault(name, threading.Lock())
+
+def get_data(name):
+    """
+    Return the shared copy of a data source, loading it on first use.
+    The file's (size, mtime) fingerprint is checked on every call and the source is
+    reloaded only when it changed. The returned data is shared between sessions and
+    must be treated as read-only.
+    """
+    fingerprint = file_fingerprint(get_source_path(name))
+    cached = _assets.get(name)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    # Concurrent sessions asking for the same source wait for a single load
+    with _get_lock(name):
+        cached = _assets.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        data = load_source(name)
+        _assets[name] = (fingerprint, data)
+        return data
+
+def clear(name=None):
+    """
+    Drop one shared source, or all of them, so the next get_data() call reloads from disk.
+    """
+    if name is None:
+        _assets.clear()
+    else:
+        _assets.pop(name, None)
@@ -1,17 +1,17 @@
 # utils/employee_review_analysis.py
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import openai
-from openai import OpenAI
-
-# Assuming 'client' is an OpenAI client instance for GPT-4 communication
-
-openai.api_key = st.secrets['openai_api_key']
-client = OpenAI(api_key=openai.api_key)  # Initialize the OpenAI client
+from utils.llm_cache import cached_completion
+from utils.figure_builder import line_trace
+from utils.llm_gateway import complete
+from utils.tracing import submit_in_context, traced
 
+@traced
 def load_review_data(file_path):
     """
     Load and preprocess employee review data from an Excel file.
@@ -22,6 +22,7 @@ def load_review_data(file_path):
     df['Month_Year'] = df['Date'].dt.to_period('M')
     return df
 
+@traced
 def get_basic_statistics(df):
     """
     Return basic statistics of the reviews DataFrame.
@@ -46,6 +47,7 @@ def get_average_rating(df):
     """
     return df['Rating'].mean()
 
+@traced
 def create_rating_distribution_chart(df):
     """
     Create and return a Plotly chart for the distribution of ratings.
@@ -54,55 +56,209 @@ def create_rating_distribution_chart(df):
     fig.update_layout(bargap=0.1)
     return fig
 
-def create_score_over_time_charts(df, score_columns):
+# Period frequency per time granularity
+GRANULARITIES = {'week': 'W', 'month': 'M', 'quarter': 'Q'}
+# Periods in the rolling window of aggregate_scores
+ROLLING_WINDOW = 3
+
+def score_totals(df, score_columns, granularity='month'):
+    """
+    Return the review count and score sum of every score column per period, in one grouped pass.
+    Totals are additive, so totals of new reviews can be merged into existing ones with merge_score_totals.
+    """
+    periods = df['Date'].dt.to_period(GRANULARITIES[granularity]).rename('Period')
+    return df[score_columns].groupby(periods).agg(['count', 'sum'])
+
+def merge_score_totals(totals, new_totals):
+    """
+    Return the combined totals of two score_totals results.
+    """
+    return totals.add(new_totals, fill_value=0).sort_index()
+
+def score_statistics(totals, rolling_window=ROLLING_WINDOW):
+    """
+    Derive per-period statistics from score totals, over every period from the first to the last.
+
+    For each score column: 'count' of reviews, 'mean' score, 'cumulative_mean' (the running average
+    of the period means, carried over periods without reviews) and 'rolling_mean' (the review-weighted
+    mean of the last rolling_window periods).
+    """
+    totals = totals.reindex(pd.period_range(totals.index.min(), totals.index.max(), freq=totals.index.freq), fill_value=0)
+    statistics = {}
+    for column in totals.columns.get_level_values(0).unique():
+        counts, sums = totals[(column, 'count')], totals[(column, 'sum')]
+        means = (sums / counts).where(counts > 0)
+        rolling_counts = counts.rolling(rolling_window, min_periods=1).sum()
+        statistics[(column, 'count')] = counts.astype(int)
+        statistics[(column, 'mean')] = means
+        statistics[(column, 'cumulative_mean')] = (means.fillna(0).cumsum() / means.notna().cumsum()).ffill()
+        statistics[(column, 'rolling_mean')] = (sums.rolling(rolling_window, min_periods=1).sum() / rolling_counts).where(rolling_counts > 0)
+    return pd.DataFrame(statistics, index=totals.index)
+
+_totals_cache = {}
+
+def cached_score_totals(key, df, score_columns, granularity='month'):
+    """
+    Return score_totals(df, ...), reusing the totals of the last call with the same key and granularity.
+    Rows are fingerprinted by content: when df starts with exactly the rows of the last call (reviews were
+    appended) only the new rows are aggregated, and any other change recomputes the totals.
+    """
+    cache_key = (key, tuple(score_columns), granularity)
+    row_hashes = pd.util.hash_pandas_object(df[['Date'] + list(score_columns)], index=True).to_numpy()
+    rows, fingerprint, totals = _totals_cache.get(cache_key, (0, None, None))
+    if totals is None or len(df) < rows or _rows_fingerprint(row_hashes[:rows]) != fingerprint:
+        rows, totals = 0, None
+    if totals is None or len(df) > rows:
+        new_totals = score_totals(df.iloc[rows:], score_columns, granularity)
+        totals = new_totals if totals is None else merge_score_totals(totals, new_totals)
+        _totals_cache[cache_key] = (len(df), _rows_fingerprint(row_hashes), totals)
+    return totals
+
+def _rows_fingerprint(row_hashes):
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+@traced
+def aggregate_scores(df, score_columns, granularity='month', rolling_window=ROLLING_WINDOW, cache_key=None):
+    """
+    Return count, mean, cumulative and rolling statistics of all score columns at week, month or quarter granularity.
+    Pass cache_key to reuse totals across calls; only appended rows are aggregated again.
+    """
+    if cache_key is None:
+        totals = score_totals(df, score_columns, granularity)
+    else:
+        totals = cached_score_totals(cache_key, df, score_columns, granularity)
+    return score_statistics(totals, rolling_window)
+
+@traced
+def create_score_over_time_charts(df, score_columns, granularity='month', cache_key=None):
     """
     Create and return a list of Plotly charts for each score category over time.
     """
+    statistics = aggregate_scores(df, score_columns, granularity, cache_key=cache_key)
+    axis_title = {'week': 'Week', 'month': 'Month and Year', 'quarter': 'Quarter'}[granularity]
     charts = []
     for column in score_columns:
-        # Group by 'Month_Year' and calculate the mean, ignoring NaN values
-        monthly_scores = df.groupby('Month_Year')[column].mean()
-
-        # Calculate the cumulative average
-        cumulative_avg = monthly_scores.expanding().mean()
-
-        # Resample to fill missing months with the last known cumulative average
-        cumulative_avg_filled = cumulative_avg.resample('M').ffill()
+        cumulative_avg = statistics[(column, 'cumulative_mean')]
 
         # Create the figure
-        fig = go.Figure(data=go.Scatter(x=cumulative_avg_filled.index.astype(str), y=cumulative_avg_filled.values, mode='lines', name='Cumulative Average'))
+        fig = go.Figure(data=line_trace(x=cumulative_avg.index.astype(str), y=cumulative_avg.values, mode='lines', name='Cumulative Average'))
 
         # Update layout
-        fig.update_layout(title=f'Cumulative Average of {column} Over Time', xaxis_title='Month and Year', yaxis_title=f'Cumulative Average {column} Score')
+        fig.update_layout(title=f'Cumulative Average of {column} Over Time', xaxis_title=axis_title, yaxis_title=f'Cumulative Average {column} Score')
 
         charts.append(fig)
     return charts
 
 # Additional functions for other visualizations and analyses...
 
-def get_model_response(messages, model='gpt-4', temperature=0.5, max_tokens=500):
+@traced
+def get_model_response(messages, model='gpt-4', temperature=0.5, max_tokens=500, refresh=False):
     """
     Get a model response from OpenAI's GPT-4.
+    Identical requests are served from the completion cache unless refresh is set.
     """
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        n=1
-    )
-    interpretation = next((choice.message.content for choice in response.choices if choice.message.role == 'assistant'), '')
-    return interpretation
+    return cached_completion(lambda: complete(messages, model, temperature, max_tokens, n=1),
+                             model, messages, temperature, max_tokens, refresh=refresh)
 
-# Function to generate detailed analysis using GPT-4
-def generate_detailed_analysis(df, analysis_topics):
+# Prompt budget per map call, leaving room for the instructions and the 500-token answer
+CHUNK_TOKEN_BUDGET = 6000
+# Concurrent map calls
+ANALYSIS_MAX_WORKERS = 4
+ANALYSIS_SYSTEM_PROMPT = 'You are a helpful assistant that analyzes text sentiment and content.'
+
+def estimate_tokens(text):
     """
-    Generate a detailed analysis of the reviews DataFrame using GPT-4.
+    Rough token count for English text (about 4 characters per token).
+    """
+    return len(text) // 4 + 1
+
+def chunk_reviews(reviews, token_budget=CHUNK_TOKEN_BUDGET):
+    """
+    Split review texts into consecutive chunks whose estimated size stays within token_budget.
+    A single review larger than the budget is truncated to fit.
     """
-    concatenated_reviews = ' '.join(df['Pros'] + ' ' + df['Cons'])
-    prompt_text = f"Analyze these employee reviews and provide detailed insights on the following topics: {', '.join(analysis_topics)}: {concatenated_reviews}"
-    analysis_messages = [
-        {'role': 'system', 'content': 'You are a helpful assistant that analyzes text sentiment and content.'},
+    chunks, chunk, chunk_tokens = [], [], 0
+    for review in reviews:
+        review_tokens = estimate_tokens(review)
+        if review_tokens > token_budget:
+            review = review[:token_budget * 4]
+            review_tokens = token_budget
+        if chunk and chunk_tokens + review_tokens > token_budget:
+            chunks.append(chunk)
+            chunk, chunk_tokens = [], 0
+        chunk.append(review)
+        chunk_tokens += review_tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _analysis_messages(prompt_text):
+    return [
+        {'role': 'system', 'content': ANALYSIS_SYSTEM_PROMPT},
         {'role': 'user', 'content': prompt_text}
     ]
-    return get_model_response(analysis_messages)
+
+def summarize_chunk(chunk, analysis_topics, refresh=False):
+    """
+    Map step: summarize one chunk of reviews for every topic.
+    """
+    prompt_text = (f"Analyze these employee reviews and summarize the evidence for each of the following topics, "
+                   f"one section per topic: {', '.join(analysis_topics)}: {' '.join(chunk)}")
+    return get_model_response(_analysis_messages(prompt_text), refresh=refresh)
+
+def _merge_group(summaries, analysis_topics, refresh=False):
+    if len(summaries) == 1:
+        return summaries[0]
+    numbered = '\n\n'.join(f"Partial summary {i + 1}:\n{summary}" for i, summary in enumerate(summaries))
+    prompt_text = (f"These are partial analyses of different batches of employee reviews. Merge them into one detailed "
+                   f"analysis with one section per topic ({', '.join(analysis_topics)}), keeping the points that recur "
+                   f"across batches and noting where batches disagree.\n\n{numbered}")
+    return get_model_response(_analysis_messages(prompt_text), refresh=refresh)
+
+def merge_summaries(summaries, analysis_topics, token_budget=CHUNK_TOKEN_BUDGET, refresh=False):
+    """
+    Reduce step: merge partial summaries per topic into one detailed analysis.
+    Summaries that do not fit in one prompt are merged in rounds.
+    """
+    while len(summaries) > 1 and estimate_tokens(' '.join(summaries)) > token_budget:
+        groups = chunk_reviews(summaries, token_budget)
+        if len(groups) == len(summaries):
+            # Every summary fills most of the budget on its own; merge them pairwise so each round makes progress
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        summaries = [_merge_group(group, analysis_topics, refresh) for group in groups]
+    return _merge_group(summaries, analysis_topics, refresh)
+
+# Function to generate detailed analysis using GPT-4
+@traced
+def generate_detailed_analysis(df, analysis_topics, token_budget=CHUNK_TOKEN_BUDGET, max_workers=ANALYSIS_MAX_WORKERS, progress_callback=None, refresh=False):
+    """
+    Generate a detailed analysis of the reviews DataFrame using GPT-4.
+
+    Reviews that fit in one prompt are analyzed in a single call. Larger sets are split into
+    token-budgeted chunks summarized concurrently (map), then merged per topic (reduce).
+    progress_callback(done, total) is called from the calling thread as chunks complete.
+    refresh=True bypasses the completion cache.
+    """
+    reviews = (df['Pros'].fillna('').astype(str) + ' ' + df['Cons'].fillna('').astype(str)).str.strip()
+    reviews = [review for review in reviews if review]
+    chunks = chunk_reviews(reviews, token_budget)
+
+    if len(chunks) <= 1:
+        concatenated_reviews = ' '.join(reviews)
+        prompt_text = f"Analyze these employee reviews and provide detailed insights on the following topics: {', '.join(analysis_topics)}: {concatenated_reviews}"
+        analysis = get_model_response(_analysis_messages(prompt_text), refresh=refresh)
+        if progress_callback:
+            progress_callback(1, 1)
+        return analysis
+
+    summaries = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {submit_in_context(executor, summarize_chunk, chunk, analysis_topics, refresh): i for i, chunk in enumerate(chunks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            summaries[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(done, len(chunks) + 1)
+    analysis = merge_summaries(summaries, analysis_topics, token_budget, refresh)
+    if progress_callback:
+        progress_callback(len(chunks) + 1, len(chunks) + 1)
+    return analysis
@@ -0,0 +1,113 @@
+# utils/figure_builder.py
+#
+# Helpers that keep chart payloads bounded whatever the size of the data:
+# long tails of categories are grouped into top-N plus "Other", dense series are
+# downsampled with Largest-Triangle-Three-Buckets (LTTB) and drawn with WebGL traces,
+# and built figures are cached by a fingerprint of their input data.
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from utils.tracing import traced
+
+# Categories drawn individually before the rest are grouped
+MAX_CATEGORIES = 10
+OTHER_LABEL = 'Other'
+# Points per series above which WebGL traces are used, and the downsampling target
+WEBGL_THRESHOLD = 1000
+MAX_POINTS = 2000
+FIGURE_CACHE_SIZE = 64
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+def top_n_labels(totals, n=MAX_CATEGORIES, keep=()):
+    """
+    Return the labels with the n largest totals, plus the labels in keep.
+    totals maps label -> size (e.g. headcount or review count).
+    """
+    ranked = pd.Series(totals, dtype=float).sort_values(ascending=False, kind='stable')
+    return list(ranked.index[:n]) + [label for label in keep if label in ranked.index[n:]]
+
+def lttb(x, y, threshold=MAX_POINTS):
+    """
+    Downsample a series to threshold points with Largest-Triangle-Three-Buckets,
+    keeping the first and last points and the visually significant ones in between.
+    x may be numeric, datetime-like or evenly spaced labels. Returns the selected (x, y).
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    if threshold >= len(x) or threshold < 3:
+        return x, y
+    if np.issubdtype(x.dtype, np.datetime64):
+        x_values = x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    elif np.issubdtype(x.dtype, np.number):
+        x_values = x.astype(float)
+    else:
+        # Category or string labels (e.g. periods) are evenly spaced
+        x_values = np.arange(len(x), dtype=float)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, len(x) - 1
+    edges = np.linspace(1, len(x) - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The next bucket's average is the third corner of the triangle
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x, next_y = x_values[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x_values[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x_values[previous] - x_values[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        selected[bucket + 1] = previous
+    return x[selected], y[selected]
+
+def line_trace(x, y, max_points=MAX_POINTS, **kwargs):
+    """
+    Return a line trace for the series, downsampled to max_points and drawn with WebGL when large.
+    """
+    if len(x) > max_points:
+        x, y = lttb(x, y, max_points)
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+def data_fingerprint(*data):
+    """
+    Return a content hash of the data a figure is built from: DataFrames, Series or JSON-serializable values.
+    """
+    digest = hashlib.sha256()
+    for item in data:
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(item, index=True).to_numpy().tobytes())
+            digest.update(repr(list(item.columns) if isinstance(item, pd.DataFrame) else item.name).encode('utf-8'))
+        else:
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+@traced
+def cached_figure(name, build_fn, *data):
+    """
+    Return build_fn(*data), reusing the figure built for identical data.
+    Figures are shared between sessions and must not be modified.
+    """
+    key = (name, data_fingerprint(*data))
+    with _lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            return _figures[key]
+    fig = build_fn(*data)
+    with _lock:
+        _figures[key] = fig
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
+
+def payload_size(fig):
+    """
+    Return the size in bytes of the figure's JSON, as sent to the browser.
+    """
+    return len(fig.to_json().encode('utf-8'))
@@ -0,0 +1,109 @@
+# utils/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Disk-backed completion cache shared by every session on the server
+LLM_CACHE_PATH = './data/.cache/llm_completions.sqlite'
+# Completions older than this are recomputed
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Least recently used completions are evicted past this total size
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+_connection = None
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'refreshes': 0}
+
+def completion_key(model, messages, temperature, max_tokens):
+    """
+    Return the content address of a completion request.
+    """
+    payload = json.dumps({'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+        _connection = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        _connection.execute("CREATE INDEX IF NOT EXISTS completions_accessed_at ON completions (accessed_at)")
+    return _connection
+
+def get_completion(key):
+    """
+    Return the cached completion for key, or None when missing or expired.
+    """
+    now = time.time()
+    with _lock:
+        try:
+            connection = _get_connection()
+            row = connection.execute(
+                "SELECT response FROM completions WHERE key = ? AND created_at >= ?",
+                (key, now - LLM_CACHE_TTL_SECONDS)).fetchone()
+            if row is not None:
+                with connection:
+                    connection.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"LLM cache error: {e}")
+            row = None
+        _stats['hits' if row is not None else 'misses'] += 1
+        return row[0] if row is not None else None
+
+def store_completion(key, model, response):
+    """
+    Store a completion, then evict expired entries and the least recently used ones past the size limit.
+    """
+    now = time.time()
+    with _lock:
+        try:
+            with _get_connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, len(response.encode('utf-8')), now, now))
+                connection.execute("DELETE FROM completions WHERE created_at < ?", (now - LLM_CACHE_TTL_SECONDS,))
+                total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+                if total_size > LLM_CACHE_MAX_BYTES:
+                    rows = connection.execute("SELECT key, size FROM completions ORDER BY accessed_at").fetchall()
+                    evicted = []
+                    for evicted_key, size in rows:
+                        if total_size <= LLM_CACHE_MAX_BYTES:
+                            break
+                        evicted.append((evicted_key,))
+                        total_size -= size
+                    connection.executemany("DELETE FROM completions WHERE key = ?", evicted)
+        except sqlite3.Error as e:
+            print(f"LLM cache error: {e}")
+
+def cached_completion(create_fn, model, messages, temperature, max_tokens, refresh=False):
+    """
+    Return create_fn()'s completion text, served from the cache for identical requests.
+    refresh=True skips the lookup and overwrites the cached entry. Empty completions are not cached.
+    """
+    key = completion_key(model, messages, temperature, max_tokens)
+    if refresh:
+        with _lock:
+            _stats['refreshes'] += 1
+    else:
+        cached = get_completion(key)
+        if cached is not None:
+            return cached
+    response = create_fn()
+    if response:
+        store_completion(key, model, response)
+    return response
+
+def get_cache_stats():
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,200 @@
+# utils/llm_gateway.py
+#
+# Single entry point for chat-completion calls. Requests run on one background
+# event loop sharing a pooled AsyncOpenAI client, behind a concurrency limit and a
+# token-bucket rate limiter, with jittered retries on 429/5xx and a per-call deadline.
+# Per-model latency and token histograms are kept in memory.
+#
+# The base URL can be pointed at a local stub with the OPENAI_BASE_URL environment variable.
+
+import asyncio
+import bisect
+import copy
+import queue
+import random
+import threading
+import time
+import openai
+import streamlit as st
+from openai import AsyncOpenAI
+from utils.tracing import traced
+
+# Requests in flight at once across all sessions
+MAX_CONCURRENCY = 8
+# Token bucket: sustained requests per second and burst size
+REQUESTS_PER_SECOND = 5.0
+RATE_LIMIT_BURST = 10
+# Retries on 429, 5xx and connection errors, with full-jitter exponential backoff
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+# Seconds a call may take, retries included
+DEFAULT_DEADLINE_SECONDS = 60.0
+
+LATENCY_BUCKETS = [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+TOKEN_BUCKETS = [64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384]
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+_semaphore = None
+_bucket = {'tokens': float(RATE_LIMIT_BURST), 'updated': time.monotonic()}
+_metrics = {}
+
+def _get_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True, name='llm-gateway').start()
+        return _loop
+
+def _get_client():
+    # Only ever called on the gateway loop, so no locking is needed
+    global _client, _semaphore
+    if _client is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        # One client for the whole process, so every call reuses its keep-alive connection pool
+        _client = AsyncOpenAI(api_key=st.secrets['openai_api_key'], max_retries=0)
+    return _client
+
+async def _acquire_rate_token():
+    """
+    Wait until the token bucket allows one more request.
+    """
+    while True:
+        now = time.monotonic()
+        _bucket['tokens'] = min(RATE_LIMIT_BURST, _bucket['tokens'] + (now - _bucket['updated']) * REQUESTS_PER_SECOND)
+        _bucket['updated'] = now
+        if _bucket['tokens'] >= 1:
+            _bucket['tokens'] -= 1
+            return
+        await asyncio.sleep((1 - _bucket['tokens']) / REQUESTS_PER_SECOND)
+
+def _model_metrics(model):
+    if model not in _metrics:
+        _metrics[model] = {
+            'calls': 0, 'errors': 0, 'retries': 0,
+            'latency': [0] * (len(LATENCY_BUCKETS) + 1),
+            'prompt_tokens': [0] * (len(TOKEN_BUCKETS) + 1),
+            'completion_tokens': [0] * (len(TOKEN_BUCKETS) + 1),
+        }
+    return _metrics[model]
+
+def _record(model, seconds, usage=None, error=False):
+    with _lock:
+        metrics = _model_metrics(model)
+        metrics['calls'] += 1
+        metrics['errors'] += int(error)
+        metrics['latency'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if usage is not None:
+            metrics['prompt_tokens'][bisect.bisect_left(TOKEN_BUCKETS, usage.prompt_tokens)] += 1
+            metrics['completion_tokens'][bisect.bisect_left(TOKEN_BUCKETS, usage.completion_tokens)] += 1
+
+def get_metrics():
+    """
+    Return per-model call counts and histograms. Histogram i counts values up to the
+    i-th bucket edge of LATENCY_BUCKETS / TOKEN_BUCKETS; the last one counts the rest.
+    """
+    with _lock:
+        return copy.deepcopy(_metrics)
+
+def _request_kwargs(messages, model, temperature, max_tokens, extra):
+    kwargs = dict(model=model, messages=messages, **extra)
+    if temperature is not None:
+        kwargs['temperature'] = temperature
+    if max_tokens is not None:
+        kwargs['max_tokens'] = max_tokens
+    return kwargs
+
+async def _with_retries(model, call):
+    for attempt in range(MAX_RETRIES + 1):
+        await _acquire_rate_token()
+        try:
+            return await call()
+        except RETRYABLE_ERRORS:
+            if attempt == MAX_RETRIES:
+                raise
+            with _lock:
+                _model_metrics(model)['retries'] += 1
+            await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)))
+
+async def acomplete(messages, model, temperature=None, max_tokens=None, deadline=DEFAULT_DEADLINE_SECONDS, **extra):
+    """
+    Return the assistant message of a chat completion. Must run on the gateway loop.
+    Raises TimeoutError past the deadline and openai.OpenAIError for non-retryable failures.
+    """
+    client = _get_client()
+    kwargs = _request_kwargs(messages, model, temperature, max_tokens, extra)
+    start = time.perf_counter()
+
+    async def call():
+        async with _semaphore:
+            return await client.chat.completions.create(**kwargs)
+
+    try:
+        response = await asyncio.wait_for(_with_retries(model, call), deadline)
+    except BaseException:
+        _record(model, time.perf_counter() - start, error=True)
+        raise
+    _record(model, time.perf_counter() - start, getattr(response, 'usage', None))
+    return next((choice.message.content for choice in response.choices if choice.message.role == 'assistant'), '') or ''
+
+@traced
+def complete(messages, model, temperature=None, max_tokens=None, deadline=DEFAULT_DEADLINE_SECONDS, **extra):
+    """
+    Blocking wrapper around acomplete() for Streamlit code and worker threads.
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        acomplete(messages, model, temperature, max_tokens, deadline, **extra), _get_loop())
+    return future.result()
+
+async def _astream(messages, model, temperature, max_tokens, deadline, extra, output):
+    client = _get_client()
+    kwargs = _request_kwargs(messages, model, temperature, max_tokens, extra)
+    kwargs.update(stream=True, stream_options={'include_usage': True})
+    start = time.perf_counter()
+    usage = None
+
+    async def consume():
+        nonlocal usage
+        # The concurrency slot is held until the whole stream has been read
+        async with _semaphore:
+            stream = await _with_retries(model, lambda: client.chat.completions.create(**kwargs))
+            async for chunk in stream:
+                usage = getattr(chunk, 'usage', None) or usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    output.put(delta)
+
+    try:
+        await asyncio.wait_for(consume(), deadline)
+    except asyncio.CancelledError:
+        # The consumer closed the stream; nobody reads the output any more
+        raise
+    except BaseException as e:
+        _record(model, time.perf_counter() - start, error=True)
+        output.put(e)
+        return
+    _record(model, time.perf_counter() - start, usage)
+    output.put(None)
+
+def stream(messages, model, temperature=None, max_tokens=None, deadline=DEFAULT_DEADLINE_SECONDS, **extra):
+    """
+    Yield the completion text in pieces as tokens arrive. Errors are raised in the caller.
+    Closing the generator early (e.g. on a Streamlit rerun) cancels the request and frees its concurrency slot.
+    """
+    output = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        _astream(messages, model, temperature, max_tokens, deadline, extra, output), _get_loop())
+    try:
+        while True:
+            piece = output.get()
+            if piece is None:
+                return
+            if isinstance(piece, BaseException):
+                raise piece
+            yield piece
+    finally:
+        future.cancel()
@@ -0,0 +1,126 @@
+# utils/parquet_cache.py
+
+import hashlib
+import json
+import os
+import pandas as pd
+from utils.tracing import traced
+
+# Directory holding the columnar copies of parsed source files
+CACHE_DIR = './data/.cache'
+
+def hash_file(file_path, chunk_size=1 << 20):
+    """
+    Return the SHA-256 hex digest of a file, read in fixed-size chunks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_fingerprint(file_path):
+    """
+    Return the cheap (size, mtime) part of a file's fingerprint.
+    """
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def content_fingerprint(file_path):
+    """
+    Return the full fingerprint of a file: size, mtime and SHA-256.
+    """
+    return dict(file_fingerprint(file_path), sha256=hash_file(file_path))
+
+def _cache_paths(source_path, name, cache_dir):
+    # Key the cache on the absolute source path so equal file names in different folders don't collide
+    path_key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:12]
+    stem = f"{name or os.path.splitext(os.path.basename(source_path))[0]}-{path_key}"
+    return os.path.join(cache_dir, f"{stem}.parquet"), os.path.join(cache_dir, f"{stem}.json")
+
+def read_manifest(manifest_path, default=None):
+    """
+    Return the JSON manifest at manifest_path, or default when it is missing or unreadable.
+    """
+    try:
+        with open(manifest_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+def write_manifest(manifest_path, manifest):
+    """
+    Replace the manifest atomically, so readers never see a partial file.
+    """
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def is_source_unchanged(source_path, entry):
+    """
+    Check a recorded fingerprint (size, mtime_ns, sha256) against the source file.
+    Size and mtime are compared first; the content hash is only recomputed when
+    the mtime moved but the size did not (e.g. a file that was touched or re-copied).
+    Returns (is_unchanged, fingerprint) where fingerprint is the current one when known.
+    """
+    if not entry:
+        return False, None
+    fingerprint = file_fingerprint(source_path)
+    if fingerprint['size'] != entry.get('size'):
+        return False, fingerprint
+    if fingerprint['mtime_ns'] == entry.get('mtime_ns'):
+        return True, dict(fingerprint, sha256=entry.get('sha256'))
+    fingerprint['sha256'] = hash_file(source_path)
+    return fingerprint['sha256'] == entry.get('sha256'), fingerprint
+
+def is_cache_valid(source_path, manifest, version):
+    """
+    Check a cache manifest's version and fingerprint against the source file.
+    Returns (is_valid, fingerprint) as is_source_unchanged() does.
+    """
+    if manifest is None or manifest.get('version') != version:
+        return False, None
+    return is_source_unchanged(source_path, manifest)
+
+@traced
+def load_cached_frame(source_path, parse_fn, name=None, version=1, cache_dir=CACHE_DIR):
+    """
+    Return parse_fn(source_path), served from a memory-mapped Parquet copy when the source is unchanged.
+
+    Parameters:
+    source_path (str): Path to the raw source file.
+    parse_fn (callable): Function that parses the raw file into a typed DataFrame.
+    name (str): Optional cache file stem, defaults to the source file name.
+    version (int): Bump when parse_fn changes so older caches are rebuilt.
+    cache_dir (str): Directory holding the cached Parquet files.
+
+    Returns:
+    DataFrame: The parsed data.
+    """
+    parquet_path, manifest_path = _cache_paths(source_path, name, cache_dir)
+    manifest = read_manifest(manifest_path)
+    is_valid, fingerprint = is_cache_valid(source_path, manifest, version)
+
+    if is_valid and os.path.exists(parquet_path):
+        if fingerprint['mtime_ns'] != manifest['mtime_ns']:
+            # Same content under a new mtime: refresh the manifest so the next check is cheap again
+            write_manifest(manifest_path, dict(manifest, **fingerprint))
+        try:
+            return pd.read_parquet(parquet_path, memory_map=True)
+        except Exception as e:
+            print(f"Cache read error for {source_path}: {e}")
+
+    data = parse_fn(source_path)
+    if fingerprint is None or 'sha256' not in fingerprint:
+        fingerprint = content_fingerprint(source_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{parquet_path}.tmp"
+        data.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        write_manifest(manifest_path, dict(fingerprint, version=version, source=os.path.abspath(source_path)))
+    except Exception as e:
+        # A missing Parquet engine or a read-only disk should never break the page
+        print(f"Cache write error for {source_path}: {e}")
+    return data
@@ -0,0 +1,84 @@
+# utils/plugin_loader.py
+#
+# Pillars are plugins registered in the [pillar_plugins] section of config.toml.
+# A plugin module exposes render(target_language) and is only imported, together
+# with its heavy dependencies, when its pillar is first selected.
+#
+# Usage: python -m utils.plugin_loader   (prints the import-time report)
+
+import ast
+import importlib
+import os
+import sys
+import threading
+import time
+from utils.config_loader import config
+from utils.tracing import traced
+
+# Entry script whose top-level imports run before the first paint
+STARTUP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hello.py')
+
+_import_times = {}
+_lock = threading.Lock()
+
+def timed_import(module_name):
+    """
+    Import a module and record how long the import took when it was not already loaded.
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _lock:
+        _import_times.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+def get_startup_modules(script_path=STARTUP_SCRIPT):
+    """
+    Return the modules imported at the top level of the entry script, in import order.
+    """
+    with open(script_path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read(), filename=script_path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def get_pillar_plugins():
+    return config.get('pillar_plugins', {})
+
+@traced
+def load_pillar(pillar_name):
+    """
+    Return the plugin module of a pillar, importing it on first use, or None if the pillar has no plugin.
+    """
+    module_name = get_pillar_plugins().get(pillar_name)
+    if module_name is None:
+        return None
+    return timed_import(module_name)
+
+def get_import_report():
+    """
+    Return [(module name, seconds)] for every import timed so far, slowest first.
+    """
+    with _lock:
+        return sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+
+def main():
+    startup_modules = get_startup_modules()
+    for module_name in startup_modules:
+        timed_import(module_name)
+    startup_total = sum(seconds for _, seconds in get_import_report())
+    for pillar_name, module_name in get_pillar_plugins().items():
+        timed_import(module_name)
+
+    print(f"Startup imports: {startup_total:.3f}s")
+    for module_name, seconds in get_import_report():
+        kind = 'startup' if module_name in startup_modules else 'plugin'
+        print(f"{seconds:8.3f}s  {kind:8}  {module_name}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+# utils/profile_generator.py
+#
+# Synthetic LinkedIn-style profile data in the 001_ALL_PROFILES layout, for load
+# testing and for reproducing slow paths without client data. Profiles are generated
+# and written in fixed-size chunks, so memory stays bounded whatever the output size.
+# Output is a ';'-delimited CSV with dd/mm/YYYY dates, like the HRIS extracts.
+#
+# Usage: python -m utils.profile_generator --profiles 1000000 --output profiles.csv [--seed 0] [--config config.json]
+
+import argparse
+import json
+import uuid
+import numpy as np
+import pandas as pd
+
+PROFILE_COLUMNS = [
+    'profile_id', 'sequence_nbr', 'start_date', 'end_date', 'company', 'title', 'country', 'region', 'location',
+    'is_title_d_and_a', 'tk_title_standardized_original_language', 'tk_title_original_language',
+    'tk_title_standardized_english', 'tk_title_standardized_group', 'tk_title_standardized_class',
+    'is_title_manager', 'odp_function', 'mck_function',
+]
+DATE_FORMAT = '%d/%m/%Y'
+CHUNK_PROFILES = 100_000
+
+# Defaults, each overridable from a JSON config file with the same keys.
+# Weights need not sum to 1.
+DEFAULT_CONFIG = {
+    # Synthetic company names with a long-tailed size distribution
+    'companies': {f'Company {i:03d}': 1 / i for i in range(1, 51)},
+    # odp_function -> weight and its mck_function breakdown
+    'functions': {
+        'Marketing & Sales': {'weight': 35, 'mck_functions': {'Sales': 60, 'Marketing': 30, 'Communications': 10}},
+        'Digital & Analytics': {'weight': 25, 'mck_functions': {'IT': 85, 'Analytics': 15}},
+        'Operations': {'weight': 15, 'mck_functions': {'Operations': 75, 'Administration': 20, 'Real Estate & Facilities': 5}},
+        'Legal, Risk & HR': {'weight': 8, 'mck_functions': {'HR': 75, 'Risk and Compliance': 20, 'Legal': 5}},
+        'Finance': {'weight': 5, 'mck_functions': {'Finance': 100}},
+        'Executive': {'weight': 3, 'mck_functions': {'Executive': 100}},
+        'Other': {'weight': 4, 'mck_functions': {'Other': 100}},
+    },
+    # country -> weight and regions (an empty region is left blank)
+    'countries': {
+        'Israel': {'weight': 50, 'regions': {'Tel Aviv': 60, '': 40}},
+        'United States': {'weight': 20, 'regions': {'New York': 25, 'California': 35, 'Texas': 10, '': 30}},
+        'Australia': {'weight': 8, 'regions': {'New South Wales': 50, 'Victoria': 20, '': 30}},
+        'Canada': {'weight': 6, 'regions': {'Ontario': 50, 'British Columbia': 20, '': 30}},
+        'United Kingdom': {'weight': 6, 'regions': {'': 100}},
+        'Japan': {'weight': 4, 'regions': {'Tokyo': 50, '': 50}},
+        'Argentina': {'weight': 3, 'regions': {'Buenos Aires': 60, '': 40}},
+        'China': {'weight': 3, 'regions': {'Shanghai': 40, 'Beijing': 30, '': 30}},
+    },
+    # Tenure per position in months: gamma distribution with this mean and shape
+    'tenure_mean_months': 28,
+    'tenure_shape': 1.6,
+    # Months between two positions: uniform from 0 to this
+    'max_gap_months': 4,
+    # Positions per profile: 1 + Poisson(mean - 1), capped
+    'sequence_mean': 2.5,
+    'sequence_max': 15,
+    # Chance that a position is at the same company as the previous one
+    'internal_move_rate': 0.3,
+    # Chance that a profile's last position is left (has an end date) before the horizon
+    'left_rate': 0.35,
+    # Chance of a manager title, growing with each career step
+    'manager_rate': 0.15,
+    'manager_rate_per_step': 0.06,
+    # Careers start between these months; positions starting after the horizon are dropped
+    'first_start': '2000-01',
+    'horizon': '2024-12',
+}
+
+def _choice(rng, weights, size):
+    """
+    Draw size labels from {label: weight}. Returns (labels array, codes).
+    """
+    labels = np.array(list(weights), dtype=object)
+    probabilities = np.array(list(weights.values()), dtype=float)
+    codes = rng.choice(len(labels), size=size, p=probabilities / probabilities.sum())
+    return labels, codes
+
+def _nested_choice(rng, outer_codes, nested):
+    """
+    Draw a sub-label for every row given its outer code, from a list of {label: weight} per outer code.
+    """
+    result = np.empty(len(outer_codes), dtype=object)
+    for code, weights in enumerate(nested):
+        rows = np.flatnonzero(outer_codes == code)
+        if len(rows):
+            labels, codes = _choice(rng, weights, len(rows))
+            result[rows] = labels[codes]
+    return result
+
+def _format_months(months):
+    """
+    Format month numbers (months since 1970-01) as first-of-month dd/mm/YYYY strings; negative means blank.
+    """
+    dates = pd.Series(np.maximum(months, 0).astype('datetime64[M]').astype('datetime64[s]')).dt.strftime(DATE_FORMAT)
+    return dates.where(months >= 0, '')
+
+def generate_chunk(rng, profiles, config):
+    """
+    Return a DataFrame of position rows for `profiles` synthetic people.
+    """
+    # Career length and position index of every row
+    lengths = 1 + np.minimum(rng.poisson(config['sequence_mean'] - 1, profiles), config['sequence_max'] - 1)
+    profile_of_row = np.repeat(np.arange(profiles), lengths)
+    rows = len(profile_of_row)
+    first_row = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    step = np.arange(rows) - np.repeat(first_row, lengths)
+    is_last = np.repeat(first_row + lengths - 1, lengths) == np.arange(rows)
+
+    # Dates in whole months: each position starts after the previous one ends plus a gap
+    first_start = int(np.datetime64(config['first_start'], 'M').astype(int))
+    horizon = int(np.datetime64(config['horizon'], 'M').astype(int))
+    tenure = np.maximum(1, np.round(rng.gamma(config['tenure_shape'], config['tenure_mean_months'] / config['tenure_shape'], rows))).astype(np.int64)
+    gap = rng.integers(0, config['max_gap_months'] + 1, rows)
+    elapsed = np.cumsum(tenure + gap) - (tenure + gap)
+    elapsed -= np.repeat(elapsed[first_row], lengths)
+    career_start = rng.integers(first_start, horizon + 1, profiles)
+    start = np.repeat(career_start, lengths) + elapsed
+    end = start + tenure
+    # The last position is still open unless the person left; anything past the horizon is open
+    still_open = (is_last & (rng.random(rows) >= config['left_rate'])) | (end > horizon)
+    end = np.where(still_open, -1, end)
+    keep = start <= horizon
+
+    # Companies: internal moves keep the previous position's company
+    company_labels, company_codes = _choice(rng, config['companies'], rows)
+    moves = (step == 0) | (rng.random(rows) >= config['internal_move_rate'])
+    company_codes = company_codes[np.maximum.accumulate(np.where(moves, np.arange(rows), 0))]
+
+    function_labels, function_codes = _choice(rng, {name: spec['weight'] for name, spec in config['functions'].items()}, rows)
+    mck_functions = _nested_choice(rng, function_codes, [spec['mck_functions'] for spec in config['functions'].values()])
+    country_labels, country_codes = _choice(rng, {name: spec['weight'] for name, spec in config['countries'].items()}, rows)
+    regions = _nested_choice(rng, country_codes, [spec['regions'] for spec in config['countries'].values()])
+    is_manager = rng.random(rows) < config['manager_rate'] + config['manager_rate_per_step'] * step
+
+    odp_functions = function_labels[function_codes]
+    titles = np.where(is_manager, 'Head of ' + mck_functions.astype(str), mck_functions.astype(str) + ' Specialist')
+    profile_ids = np.array([str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(profiles)], dtype=object)
+
+    chunk = pd.DataFrame({
+        'profile_id': profile_ids[profile_of_row],
+        'sequence_nbr': step + 1,
+        'start_date': _format_months(start),
+        'end_date': _format_months(end),
+        'company': company_labels[company_codes],
+        'title': titles,
+        'country': country_labels[country_codes],
+        'region': regions,
+        'location': '',
+        'is_title_d_and_a': np.where(odp_functions == 'Digital & Analytics', 'TRUE', 'FALSE'),
+        'tk_title_standardized_original_language': '',
+        'tk_title_original_language': '',
+        'tk_title_standardized_english': titles,
+        'tk_title_standardized_group': '',
+        'tk_title_standardized_class': '',
+        'is_title_manager': np.where(is_manager, 'TRUE', 'FALSE'),
+        'odp_function': odp_functions,
+        'mck_function': mck_functions,
+    }, columns=PROFILE_COLUMNS)
+    return chunk[keep].reset_index(drop=True)
+
+def generate_profiles(output_path, profiles, seed=0, config=None, chunk_profiles=CHUNK_PROFILES):
+    """
+    Stream `profiles` synthetic profiles to a ';'-delimited CSV, one chunk at a time.
+    The same seed, config and chunk size always produce the same file. Returns the number of rows written.
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as file:
+        for chunk_start in range(0, profiles, chunk_profiles):
+            chunk = generate_chunk(rng, min(chunk_profiles, profiles - chunk_start), config)
+            chunk.to_csv(file, sep=';', index=False, header=chunk_start == 0)
+            written += len(chunk)
+            print(f"{min(chunk_start + chunk_profiles, profiles):,} profiles, {written:,} rows")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic profiles in the 001_ALL_PROFILES layout.')
+    parser.add_argument('--profiles', type=int, required=True, help='Number of people to generate')
+    parser.add_argument('--output', required=True, help='CSV file to write')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--config', help='JSON file overriding keys of DEFAULT_CONFIG (companies, functions, tenure, ...)')
+    parser.add_argument('--chunk-profiles', type=int, default=CHUNK_PROFILES, help='Profiles generated per chunk')
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, 'r') as file:
+            config = json.load(file)
+    generate_profiles(args.output, args.profiles, args.seed, config, args.chunk_profiles)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# utils/review_store.py
+#
+# Columnar store of employee reviews, partitioned by company. Each review workbook
+# declared in config.toml is normalized to one typed layout, keyed by a stable review
+# key, and appended to its company's partition; reviews already stored are skipped.
+# New reviews get sentiment scores on the way in. Ingestion runs offline; pages only
+# read a company's reviews as memory-mapped Parquet and never parse Excel.
+#
+# Usage: python -m utils.review_store [--force]
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.data_registry import get_source_path, load_source
+from utils.parquet_cache import content_fingerprint, is_source_unchanged, read_manifest, write_manifest
+from utils.sentiment import score_reviews
+from utils.tracing import traced
+
+# Bump when the normalized layout changes; each version gets its own folder
+REVIEW_STORE_VERSION = 2
+REVIEW_STORE_DIR = f'./data/reviews/store/v{REVIEW_STORE_VERSION}'
+
+# Company -> review data source declared in config.toml
+REVIEW_SOURCES = {
+    'Incredibuild': 'incredibuild_reviews',
+    'Bringg': 'bringg_reviews',
+}
+
+# Text columns identifying a review; together with the company and date they form its key
+KEY_COLUMNS = ['Title', 'Pros', 'Cons']
+# Text columns given a '<column>_polarity' sentiment score when their reviews are appended
+SENTIMENT_COLUMNS = ['Pros', 'Cons']
+
+_frames = {}
+_lock = threading.Lock()
+
+def _manifest_path(store_dir):
+    return os.path.join(store_dir, 'manifest.json')
+
+def _partition_dir(store_dir, company):
+    return os.path.join(store_dir, f'company={company}')
+
+def _read_manifest(store_dir):
+    return read_manifest(_manifest_path(store_dir), {'version': REVIEW_STORE_VERSION, 'companies': {}})
+
+def review_keys(df, company):
+    """
+    Return a stable key per review: a hash of the company, review date and review texts.
+    """
+    parts = [pd.Series(company, index=df.index), df['Date'].dt.strftime('%Y-%m-%d').fillna('')]
+    parts += [df[column].fillna('').astype(str) if column in df.columns else pd.Series('', index=df.index)
+              for column in KEY_COLUMNS]
+    payload = parts[0].str.cat(parts[1:], sep='\x1f')
+    return payload.map(lambda text: hashlib.sha256(text.encode('utf-8')).hexdigest()[:20])
+
+def normalize_reviews(df, company):
+    """
+    Return the reviews in the store layout: typed Rating, Date and Month_Year, plus company and review_key.
+    Reviews repeated within the frame are kept once.
+    """
+    df = df.copy()
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').astype('Int64')
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce').astype('datetime64[ns]')
+    df['Month_Year'] = df['Date'].dt.to_period('M')
+    df.insert(0, 'company', company)
+    df.insert(0, 'review_key', review_keys(df, company))
+    return df.drop_duplicates('review_key').reset_index(drop=True)
+
+def _stored_keys(store_dir, company):
+    partition_dir = _partition_dir(store_dir, company)
+    if not os.path.isdir(partition_dir):
+        return set()
+    keys = set()
+    for file_name in sorted(os.listdir(partition_dir)):
+        if file_name.endswith('.parquet'):
+            keys.update(pq.read_table(os.path.join(partition_dir, file_name), columns=['review_key']).column(0).to_pylist())
+    return keys
+
+def ingest_reviews(sources=REVIEW_SOURCES, store_dir=REVIEW_STORE_DIR, force=False):
+    """
+    Append the new reviews of every source whose workbook changed since the last ingestion.
+    Returns {company: number of reviews appended} for the sources that were read; missing workbooks are skipped.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _read_manifest(store_dir)
+    appended = {}
+
+    for company, source_name in sources.items():
+        source_path = get_source_path(source_name)
+        if not os.path.exists(source_path):
+            continue
+        entry = manifest['companies'].get(company, {})
+        if not force and is_source_unchanged(source_path, entry)[0]:
+            continue
+
+        reviews = normalize_reviews(load_source(source_name), company)
+        new_reviews = reviews[~reviews['review_key'].isin(_stored_keys(store_dir, company))]
+        parts = entry.get('parts', [])
+        if len(new_reviews):
+            new_reviews = score_reviews(new_reviews, [column for column in SENTIMENT_COLUMNS if column in new_reviews.columns])
+            partition_dir = _partition_dir(store_dir, company)
+            os.makedirs(partition_dir, exist_ok=True)
+            part_name = f'part-{time.time_ns()}.parquet'
+            tmp_path = os.path.join(partition_dir, f'{part_name}.tmp')
+            new_reviews.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, os.path.join(partition_dir, part_name))
+            parts = parts + [part_name]
+
+        manifest['companies'][company] = dict(content_fingerprint(source_path), source=source_path, parts=parts,
+                                              rows=entry.get('rows', 0) + len(new_reviews))
+        appended[company] = len(new_reviews)
+
+    if appended:
+        manifest['version'] = REVIEW_STORE_VERSION
+        write_manifest(_manifest_path(store_dir), manifest)
+    return appended
+
+@traced
+def load_reviews(company, store_dir=REVIEW_STORE_DIR):
+    """
+    Return the stored reviews of a company. Raises FileNotFoundError when none were ingested.
+    Read-only: workbooks are ingested by `python -m utils.review_store`, never at request time.
+    The frame is shared between sessions until the next ingestion and must be treated as read-only.
+    """
+    entry = _read_manifest(store_dir)['companies'].get(company)
+    if not entry or not entry['parts']:
+        raise FileNotFoundError(f"No stored reviews for '{company}'. Run: python -m utils.review_store")
+
+    cache_key = (store_dir, company)
+    with _lock:
+        cached = _frames.get(cache_key)
+    if cached is not None and cached[0] == entry['parts']:
+        return cached[1]
+    partition_dir = _partition_dir(store_dir, company)
+    tables = [pq.read_table(os.path.join(partition_dir, part), memory_map=True) for part in entry['parts']]
+    reviews = pa.concat_tables(tables, promote_options='default').to_pandas()
+    with _lock:
+        _frames[cache_key] = (entry['parts'], reviews)
+    return reviews
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest the employee review workbooks into the review store.')
+    parser.add_argument('--force', action='store_true', help='Re-read every workbook even if it is unchanged')
+    parser.add_argument('--output', default=REVIEW_STORE_DIR, help='Directory of the review store')
+    args = parser.parse_args()
+    appended = ingest_reviews(store_dir=args.output, force=args.force)
+    for company in REVIEW_SOURCES:
+        if company in appended:
+            print(f"{company}: {appended[company]} new reviews")
+        else:
+            print(f"{company}: up to date or workbook not found")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# utils/sentiment.py
+#
+# Batch sentiment scoring for review texts (Glassdoor Pros/Cons, Play Store content,
+# Reddit comments). Polarity comes from TextBlob, as in the review notebooks. Scores
+# are cached on disk by text hash, so re-scoring a source only scores the new texts,
+# and large batches of new texts are spread over a process pool.
+
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+SENTIMENT_CACHE_PATH = './data/.cache/sentiment.sqlite'
+# Part of every cache key; bump when the scorer changes so old scores are recomputed
+SCORER_VERSION = 'textblob-polarity-1'
+SENTIMENT_MAX_WORKERS = os.cpu_count() or 1
+# Texts per pool task, and the smallest batch worth starting a pool for
+SENTIMENT_CHUNK_SIZE = 256
+MIN_PARALLEL_TEXTS = 1000
+# Category bins used by the review notebooks
+SENTIMENT_BINS = [-1, -0.01, 0.01, 1]
+SENTIMENT_LABELS = ['Negative', 'Neutral', 'Positive']
+
+_connection = None
+_lock = threading.Lock()
+_stats = {'hits': 0, 'scored': 0}
+
+def _text_key(text):
+    return hashlib.sha256(f'{SCORER_VERSION}\x1f{text}'.encode('utf-8')).hexdigest()
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(SENTIMENT_CACHE_PATH), exist_ok=True)
+        _connection = sqlite3.connect(SENTIMENT_CACHE_PATH, check_same_thread=False)
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, polarity REAL NOT NULL)")
+    return _connection
+
+def _lookup(keys):
+    """
+    Return {key: polarity} for the keys found in the cache.
+    """
+    found = {}
+    with _lock:
+        try:
+            connection = _get_connection()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                found.update(connection.execute(
+                    f"SELECT key, polarity FROM scores WHERE key IN ({','.join('?' * len(batch))})", batch).fetchall())
+        except sqlite3.Error as e:
+            print(f"Sentiment cache error: {e}")
+    return found
+
+def _store(scores):
+    with _lock:
+        try:
+            with _get_connection() as connection:
+                connection.executemany("INSERT OR REPLACE INTO scores (key, polarity) VALUES (?, ?)", scores.items())
+        except sqlite3.Error as e:
+            print(f"Sentiment cache error: {e}")
+
+def _score_chunk(texts):
+    # Runs in the worker processes; TextBlob is imported there on first use
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+def _score(texts, max_workers, chunk_size):
+    if len(texts) < MIN_PARALLEL_TEXTS or max_workers <= 1:
+        return _score_chunk(texts)
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    # Spawned workers: forking a threaded server process is not safe
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return [polarity for chunk_scores in pool.map(_score_chunk, chunks) for polarity in chunk_scores]
+
+def score_texts(texts, max_workers=SENTIMENT_MAX_WORKERS, chunk_size=SENTIMENT_CHUNK_SIZE):
+    """
+    Return the TextBlob polarity (-1 to 1) of every text, in order.
+    Missing or blank texts score 0. Only texts not in the cache are scored.
+    """
+    texts = ['' if pd.isna(text) else str(text) for text in texts]
+    unique_texts = [text for text in dict.fromkeys(texts) if text.strip()]
+    keys = {text: _text_key(text) for text in unique_texts}
+    cached = _lookup(list(keys.values()))
+
+    missing = [text for text in unique_texts if keys[text] not in cached]
+    if missing:
+        scored = dict(zip((keys[text] for text in missing), _score(missing, max_workers, chunk_size)))
+        _store(scored)
+        cached.update(scored)
+    with _lock:
+        _stats['hits'] += len(unique_texts) - len(missing)
+        _stats['scored'] += len(missing)
+    return [cached[keys[text]] if text in keys else 0.0 for text in texts]
+
+def sentiment_category(polarity):
+    """
+    Return the Negative/Neutral/Positive category of polarity scores, with the notebooks' bins.
+    """
+    return pd.cut(pd.Series(polarity), bins=SENTIMENT_BINS, labels=SENTIMENT_LABELS, include_lowest=True)
+
+def score_reviews(df, text_columns, **kwargs):
+    """
+    Return a copy of df with a '<column>_polarity' score column for every text column.
+    All columns are scored in one batch.
+    """
+    df = df.copy()
+    texts = [text for column in text_columns for text in df[column].tolist()]
+    scores = score_texts(texts, **kwargs)
+    for i, column in enumerate(text_columns):
+        df[f'{column}_polarity'] = scores[i * len(df):(i + 1) * len(df)]
+    return df
+
+def get_cache_stats():
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,105 @@
+# utils/talent_aggregates.py
+#
+# Offline build step for the Talent pillar. Turns the raw profile CSVs into
+# pre-aggregated attrition cubes that Hello.py reads at request time.
+#
+# Usage: python -m utils.talent_aggregates [--force] [--stream | --no-stream]
+
+import argparse
+import os
+import pandas as pd
+from utils.data_registry import get_source, get_source_path, load_source
+from utils.parquet_cache import content_fingerprint, is_source_unchanged, read_manifest, write_manifest
+from utils.talent_recruitment_analysis import PROFILE_CHUNK_ROWS, compute_attrition_cube, compute_attrition_cube_chunked
+from utils.tracing import traced
+
+# Bump when the cube layout or the parsing rules change; each version gets its own folder
+AGGREGATES_VERSION = 1
+AGGREGATES_DIR = f'./data/Incredibuild/HRIS/aggregates/v{AGGREGATES_VERSION}'
+
+# Aggregate table name -> profiles data source declared in config.toml
+TALENT_SOURCES = {
+    'incredibuild': 'incredibuild_profiles',
+    'benchmark': 'benchmark_profiles',
+}
+
+# Source files from this size on are aggregated chunk by chunk instead of loaded whole
+STREAMING_MIN_BYTES = 256 << 20
+
+def _manifest_path(aggregates_dir):
+    return os.path.join(aggregates_dir, 'manifest.json')
+
+def _table_path(aggregates_dir, name):
+    return os.path.join(aggregates_dir, f'{name}_cube.parquet')
+
+def _read_manifest(aggregates_dir):
+    return read_manifest(_manifest_path(aggregates_dir), {'version': AGGREGATES_VERSION, 'tables': {}})
+
+def _is_up_to_date(entry, source_path, table_path):
+    return os.path.exists(table_path) and is_source_unchanged(source_path, entry)[0]
+
+def build_aggregates(sources=TALENT_SOURCES, aggregates_dir=AGGREGATES_DIR, force=False, stream=None, chunk_rows=PROFILE_CHUNK_ROWS):
+    """
+    Build the attrition cube table for every source whose file changed since the last build.
+    Sources are streamed in chunks of chunk_rows rows when stream is True, or by default when
+    the file is at least STREAMING_MIN_BYTES; both modes build the same cube.
+    Returns the list of table names that were rebuilt.
+    """
+    os.makedirs(aggregates_dir, exist_ok=True)
+    manifest = _read_manifest(aggregates_dir)
+    rebuilt = []
+
+    for name, source_name in sources.items():
+        source_path = get_source_path(source_name)
+        table_path = _table_path(aggregates_dir, name)
+        if not os.path.exists(source_path):
+            print(f"Skipping {name}: {source_path} not found")
+            continue
+        if not force and _is_up_to_date(manifest['tables'].get(name), source_path, table_path):
+            print(f"{name}: up to date")
+            continue
+
+        streamed = stream if stream is not None else os.path.getsize(source_path) >= STREAMING_MIN_BYTES
+        if streamed:
+            cube = compute_attrition_cube_chunked(source_path, chunk_rows=chunk_rows, **get_source(source_name).get('options', {}))
+            rows = None
+        else:
+            data = load_source(source_name)
+            cube = compute_attrition_cube(data)
+            rows = len(data)
+        tmp_path = f'{table_path}.tmp'
+        cube.reset_index().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, table_path)
+
+        manifest['tables'][name] = dict(content_fingerprint(source_path), source=source_path, rows=rows, cells=len(cube), streamed=streamed)
+        rebuilt.append(name)
+        print(f"{name}: built {len(cube)} cells from {'a streamed file' if streamed else f'{rows} profiles'}")
+
+    manifest['version'] = AGGREGATES_VERSION
+    write_manifest(_manifest_path(aggregates_dir), manifest)
+    return rebuilt
+
+@traced
+def load_aggregate(name, aggregates_dir=AGGREGATES_DIR):
+    """
+    Load a pre-built attrition cube. Raises FileNotFoundError when the build step has not been run.
+    """
+    table_path = _table_path(aggregates_dir, name)
+    if not os.path.exists(table_path):
+        raise FileNotFoundError(f"Missing aggregate '{name}'. Run: python -m utils.talent_aggregates")
+    cube = pd.read_parquet(table_path, memory_map=True)
+    index_columns = [column for column in cube.columns if column not in ('starts', 'terminations', 'headcount', 'attrition')]
+    return cube.set_index(index_columns)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the pre-aggregated Talent pillar tables.')
+    parser.add_argument('--force', action='store_true', help='Rebuild every table even if its source is unchanged')
+    parser.add_argument('--output', default=AGGREGATES_DIR, help='Directory for the aggregate tables')
+    parser.add_argument('--stream', action=argparse.BooleanOptionalAction, default=None,
+                        help=f'Read sources in chunks (default: only files of {STREAMING_MIN_BYTES >> 20} MiB or more)')
+    parser.add_argument('--chunk-rows', type=int, default=PROFILE_CHUNK_ROWS, help='Rows per chunk when streaming')
+    args = parser.parse_args()
+    build_aggregates(aggregates_dir=args.output, force=args.force, stream=args.stream, chunk_rows=args.chunk_rows)
+
+if __name__ == '__main__':
+    main()
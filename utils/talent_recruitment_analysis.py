@@ -1,48 +1,284 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from pandas.tseries.api import guess_datetime_format
+from utils.parquet_cache import load_cached_frame
+from utils.figure_builder import MAX_CATEGORIES, OTHER_LABEL, top_n_labels, line_trace
+from utils.tracing import traced
 
-def load_and_preprocess_data(incredibuild_file_path, all_profiles_file_path):
-    incredibuild_data = pd.read_csv(incredibuild_file_path, delimiter=';')
-    incredibuild_data['start_date'] = pd.to_datetime(incredibuild_data['start_date'], format='%d/%m/%Y', errors='coerce')
-    incredibuild_data['end_date'] = pd.to_datetime(incredibuild_data['end_date'], format='%d/%m/%Y', errors='coerce')
-    incredibuild_data['end_date'].fillna(pd.Timestamp('2025-01-01'), inplace=True)
+# Placeholder end date for positions that are still open
+OPEN_END_DATE = pd.Timestamp('2025-01-01')
+
+# Low-cardinality columns stored as categoricals in the columnar cache
+CATEGORICAL_COLUMNS = ['company', 'odp_function', 'country']
+DATE_COLUMNS = ['start_date', 'end_date']
+# Read as text, so their type never depends on how much of the file is read at once
+PROFILE_TEXT_COLUMNS = DATE_COLUMNS + CATEGORICAL_COLUMNS
+# Bump when parsing changes so cached profile frames are rebuilt
+PROFILES_CACHE_VERSION = 2
+# Strings pandas skips when inferring a date format from a column's first value
+_SKIPPED_DATE_STRINGS = {'', 'now', 'today', 'NaT', 'nat', 'NAT', 'nan', 'NaN', 'NAN'}
+
+def parse_profiles(file_path, date_format=None, dayfirst=False):
+    """
+    Parse a ';'-delimited profiles CSV into typed dates and categorical columns.
+    """
+    data = pd.read_csv(file_path, delimiter=';', low_memory=False, dtype={column: str for column in PROFILE_TEXT_COLUMNS})
+    return _parse_profile_columns(data, date_format, dayfirst)
+
+def _parse_profile_columns(data, date_format=None, dayfirst=False):
+    # date_format is one format for both date columns, or {column: format}
+    for column in DATE_COLUMNS:
+        column_format = date_format.get(column) if isinstance(date_format, dict) else date_format
+        data[column] = pd.to_datetime(data[column], format=column_format, errors='coerce', dayfirst=dayfirst)
+    data['end_date'] = data['end_date'].fillna(OPEN_END_DATE)
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype('category')
+    return data
 
-    all_profiles_data = pd.read_csv(all_profiles_file_path, delimiter=';')
-    all_profiles_data['start_date'] = pd.to_datetime(all_profiles_data['start_date'], errors='coerce', dayfirst=True)
-    all_profiles_data['end_date'] = pd.to_datetime(all_profiles_data['end_date'], errors='coerce', dayfirst=True)
-    all_profiles_data['end_date'].fillna(pd.Timestamp('2025-01-01'), inplace=True)
+def _infer_date_format(values, dayfirst=False):
+    """
+    Return the format pd.to_datetime infers for a whole column: guessed from its first value,
+    or 'mixed' (every value parsed on its own) when no format fits. None while no value was seen.
+    """
+    values = values.dropna()
+    values = values[~values.isin(_SKIPPED_DATE_STRINGS)]
+    if values.empty:
+        return None
+    return guess_datetime_format(values.iloc[0], dayfirst=dayfirst) or 'mixed'
 
+def load_profiles(file_path, date_format=None, dayfirst=False):
+    """
+    Load a profiles CSV, reusing the Parquet cache when the file is unchanged.
+    """
+    return load_cached_frame(file_path, lambda path: parse_profiles(path, date_format=date_format, dayfirst=dayfirst),
+                             version=PROFILES_CACHE_VERSION)
+
+def load_and_preprocess_data(incredibuild_file_path, all_profiles_file_path):
+    """
+    Load both profile files, reusing the Parquet cache when the CSVs are unchanged.
+    """
+    incredibuild_data = load_profiles(incredibuild_file_path, date_format='%d/%m/%Y')
+    all_profiles_data = load_profiles(all_profiles_file_path, dayfirst=True)
     return incredibuild_data, all_profiles_data
 
-def compute_attrition_and_headcount(data):
-    data['Start Year'] = data['start_date'].dt.year
-    data['Termination Year'] = data['end_date'].dt.year
-    years = sorted(data['Start Year'].unique())
-    attrition_rates = {}
-    headcounts = {}
+# Dimensions of the attrition cube, in index order
+CUBE_DIMENSIONS = ['company', 'odp_function']
+
+@traced
+def compute_attrition_cube(data, dimensions=CUBE_DIMENSIONS):
+    """
+    Compute starts, terminations, headcount and attrition per dimension value and year in a single pass.
+
+    Rows are binned into a dense (dimension values x years) histogram with np.bincount, and
+    headcount is the cumulative sum of starts along the year axis. A termination counts in
+    the year it happens, for positions that started in or before that year.
+
+    Parameters:
+    data (DataFrame): Profiles with 'start_date' and 'end_date' columns.
+    dimensions (list): Columns to break the cube down by; missing columns are skipped.
+
+    Returns:
+    DataFrame: Indexed by dimensions + ['year'], with 'starts', 'terminations', 'headcount'
+    and 'attrition' columns. Only cells with a start or a termination are kept.
+    """
+    dimensions = [dimension for dimension in dimensions if dimension in data.columns]
+    start_years = data['start_date'].dt.year.to_numpy(dtype=float)
+    term_years = data['end_date'].dt.year.to_numpy(dtype=float)
+    has_start = ~np.isnan(start_years)
+    is_term = has_start & ~np.isnan(term_years) & (term_years >= start_years)
+    index_names = dimensions + ['year']
+    columns = ['starts', 'terminations', 'headcount', 'attrition']
+
+    if not has_start.any():
+        empty_index = pd.MultiIndex.from_arrays([[] for _ in index_names], names=index_names)
+        return pd.DataFrame(columns=columns, index=empty_index)
+
+    first_year = int(start_years[has_start].min())
+    last_year = int(max(start_years[has_start].max(), term_years[is_term].max() if is_term.any() else first_year))
+    num_years = last_year - first_year + 1
+
+    # Flatten every dimension plus the year into a single cell code for np.bincount
+    codes, levels = [], []
+    for dimension in dimensions:
+        dimension_codes, uniques = pd.factorize(data[dimension], use_na_sentinel=False)
+        codes.append(dimension_codes)
+        levels.append(uniques)
+    shape = tuple(len(level) for level in levels) + (num_years,)
+
+    def histogram(mask, years):
+        cells = np.ravel_multi_index([code[mask] for code in codes] + [years[mask].astype(np.int64) - first_year], shape)
+        return np.bincount(cells, minlength=int(np.prod(shape))).reshape(shape)
+
+    starts = histogram(has_start, start_years)
+    terminations = histogram(is_term, term_years)
+    headcount = starts.cumsum(axis=-1)
 
-    for year in years:
-        start_count = data[data['Start Year'] <= year].shape[0]
-        term_count = data[(data['Termination Year'] == year) & (data['Start Year'] <= year)].shape[0]
-        attrition_rates[year] = term_count / start_count if start_count > 0 else 0
-        headcounts[year] = start_count
+    cells = np.nonzero((starts > 0) | (terminations > 0))
+    index = pd.MultiIndex.from_arrays(
+        [level[cell] for level, cell in zip(levels, cells[:-1])] + [cells[-1] + first_year],
+        names=index_names)
+    cube = pd.DataFrame({
+        'starts': starts[cells],
+        'terminations': terminations[cells],
+        'headcount': headcount[cells],
+    }, index=index)
+    cube['attrition'] = _attrition_rate(cube)
+    return cube.sort_index()
 
-    return attrition_rates, headcounts
+# Rows read per chunk by the streaming cube computation
+PROFILE_CHUNK_ROWS = 500_000
+
+def attrition_counts(data, dimensions=CUBE_DIMENSIONS):
+    """
+    Return the starts and terminations per dimension value and year of a set of profiles.
+    Counts of disjoint sets of profiles add up with merge_attrition_counts().
+    """
+    return compute_attrition_cube(data, dimensions)[['starts', 'terminations']]
+
+def merge_attrition_counts(counts, new_counts):
+    """
+    Return the cell-wise sum of two attrition count tables with the same dimensions.
+    """
+    if counts is None:
+        return new_counts
+    dimensions = list(counts.index.names)
+    # Chunks have their own categories, so dimension values are merged as plain objects
+    merged = pd.concat([_as_object_levels(counts), _as_object_levels(new_counts)])
+    return merged.groupby(level=dimensions, dropna=False, sort=False).sum()
+
+def _as_object_levels(frame):
+    frame = frame.copy(deep=False)
+    frame.index = pd.MultiIndex.from_arrays(
+        [frame.index.get_level_values(name).astype(object) for name in frame.index.names], names=frame.index.names)
+    return frame
+
+def cube_from_counts(counts, categories=None):
+    """
+    Complete merged attrition counts into a cube, as compute_attrition_cube() returns it.
+    Headcount is the running sum of starts per dimension value. categories optionally maps a
+    dimension to every value of its source column, including values without any cell.
+    """
+    dimensions = [name for name in counts.index.names if name != 'year']
+    cube = counts[['starts', 'terminations']].astype(np.int64).reset_index()
+    for dimension in dimensions:
+        if categories and dimension in categories:
+            cube[dimension] = pd.Categorical(cube[dimension], categories=sorted(categories[dimension]))
+        else:
+            cube[dimension] = cube[dimension].astype('category')
+    cube = cube[['starts', 'terminations']].set_axis(pd.MultiIndex.from_frame(cube[dimensions + ['year']])).sort_index()
+    cube['headcount'] = cube.groupby(level=dimensions, dropna=False, observed=True)['starts'].cumsum() if dimensions else cube['starts'].cumsum()
+    cube['attrition'] = _attrition_rate(cube)
+    return cube
+
+@traced
+def compute_attrition_cube_chunked(file_path, dimensions=CUBE_DIMENSIONS, date_format=None, dayfirst=False, chunk_rows=PROFILE_CHUNK_ROWS):
+    """
+    Compute the attrition cube of a profiles CSV without loading it in memory.
+
+    The file is read chunk_rows rows at a time, only the date and dimension columns are
+    parsed, and each chunk is folded into the running starts and terminations counts.
+    Memory depends on the chunk size and the number of cells, not on the file size.
+    The result equals compute_attrition_cube(parse_profiles(file_path, ...), dimensions) for
+    dimensions among PROFILE_TEXT_COLUMNS: both read them as text, and the date formats are
+    inferred once per column, from its first value, as a whole-file read does.
+    """
+    header = pd.read_csv(file_path, delimiter=';', nrows=0).columns
+    dimensions = [dimension for dimension in dimensions if dimension in header]
+    chunks = pd.read_csv(file_path, delimiter=';', usecols=DATE_COLUMNS + dimensions, low_memory=False,
+                         dtype={column: str for column in DATE_COLUMNS + dimensions}, chunksize=chunk_rows)
+    date_formats = {column: date_format for column in DATE_COLUMNS}
+    # Every value of each dimension, which the in-memory cube keeps as categories
+    categories = {dimension: set() for dimension in dimensions}
+    counts = None
+    for chunk in chunks:
+        for column in DATE_COLUMNS:
+            if date_formats[column] is None:
+                date_formats[column] = _infer_date_format(chunk[column], dayfirst)
+        for dimension in dimensions:
+            categories[dimension].update(chunk[dimension].dropna().unique())
+        chunk = _parse_profile_columns(chunk, date_formats, dayfirst)
+        counts = merge_attrition_counts(counts, attrition_counts(chunk, dimensions))
+    if counts is None:
+        # Header only
+        empty = pd.DataFrame(columns=DATE_COLUMNS + dimensions).astype({column: 'datetime64[ns]' for column in DATE_COLUMNS})
+        return compute_attrition_cube(empty, dimensions)
+    return cube_from_counts(counts, categories)
+
+def _attrition_rate(frame):
+    headcount = frame['headcount'].to_numpy()
+    return np.divide(frame['terminations'].to_numpy(), headcount, out=np.zeros(len(frame)), where=headcount > 0)
+
+def rollup_attrition_cube(cube, by=None):
+    """
+    Aggregate the cube over every dimension not in `by` and recompute headcount and attrition.
+    Rows with a missing value in one of the `by` dimensions are dropped.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    rollup = cube.groupby(by + ['year'], observed=True)[['starts', 'terminations']].sum()
+    rollup['headcount'] = rollup.groupby(level=by)['starts'].cumsum() if by else rollup['starts'].cumsum()
+    rollup['attrition'] = _attrition_rate(rollup)
+    return rollup
+
+def bucket_cube_level(cube, level, n=MAX_CATEGORIES, keep=(), other_label=OTHER_LABEL):
+    """
+    Group the values of one cube dimension beyond the n largest (by starts) into other_label.
+    Starts and terminations are summed, so headcount and attrition of the group stay exact.
+    """
+    kept = top_n_labels(cube.groupby(level=level, observed=True)['starts'].sum(), n, keep)
+    frame = cube[['starts', 'terminations']].reset_index()
+    labels = frame[level].astype(object)
+    frame[level] = labels.where(labels.isin(kept), other_label)
+    dimensions = [name for name in cube.index.names if name != 'year']
+    bucketed = frame.groupby(dimensions + ['year'], dropna=False)[['starts', 'terminations']].sum()
+    bucketed['headcount'] = bucketed.groupby(level=dimensions, dropna=False)['starts'].cumsum()
+    bucketed['attrition'] = _attrition_rate(bucketed)
+    return bucketed
+
+def _to_year_dict(frame, column):
+    # Only report the years where positions started, as the dashboard always has
+    frame = frame[frame['starts'] > 0]
+    return dict(zip(frame.index.get_level_values('year').tolist(), frame[column].tolist()))
+
+def _to_group_dict(frame, level, column):
+    return {group: _to_year_dict(group_frame, column) for group, group_frame in frame.groupby(level=level, observed=True)}
+
+@traced
+def attrition_and_headcount_from_cube(cube):
+    """
+    Return the overall {year: attrition rate} and {year: headcount} dictionaries from a cube.
+    """
+    overall = rollup_attrition_cube(cube)
+    return _to_year_dict(overall, 'attrition'), _to_year_dict(overall, 'headcount')
+
+@traced
+def headcount_by_company_from_cube(cube, top_n=None):
+    """
+    Return {company: {year: headcount}} from a cube.
+    With top_n, companies beyond the top_n largest are grouped into 'Other'.
+    """
+    if top_n is not None:
+        cube = bucket_cube_level(cube, 'company', top_n)
+    return _to_group_dict(rollup_attrition_cube(cube, 'company'), 'company', 'headcount')
+
+@traced
+def function_wise_attrition_from_cube(cube, top_n=None):
+    """
+    Return {function: {year: attrition rate}} from a cube.
+    With top_n, functions beyond the top_n largest are grouped into 'Other'.
+    """
+    if top_n is not None:
+        cube = bucket_cube_level(cube, 'odp_function', top_n)
+    return _to_group_dict(rollup_attrition_cube(cube, 'odp_function'), 'odp_function', 'attrition')
+
+def compute_attrition_and_headcount(data):
+    return attrition_and_headcount_from_cube(compute_attrition_cube(data))
 
 def compute_headcount_by_company(data):
-    companies = data['company'].unique()
-    company_headcounts = {}
-    for company in companies:
-        company_data = data[data['company'] == company]
-        company_data['Start Year'] = company_data['start_date'].dt.year
-        years = sorted(company_data['Start Year'].unique())
-        headcounts = {}
-        for year in years:
-            headcount = company_data[company_data['Start Year'] <= year].shape[0]
-            headcounts[year] = headcount
-        company_headcounts[company] = headcounts
-    return company_headcounts
+    return headcount_by_company_from_cube(compute_attrition_cube(data, ['company']))
 
+@traced
 def create_comparison_chart(data_incredibuild, data_benchmark, title, yaxis_title):
     fig = go.Figure()
     for label, data in [("Incredibuild", data_incredibuild), ("Benchmark", data_benchmark)]:
@@ -60,8 +296,10 @@ def create_comparison_chart(data_incredibuild, data_benchmark, title, yaxis_titl
     )
     return fig
 
+@traced
 def create_company_headcount_chart(company_headcounts, title):
     fig = go.Figure()
+    # Long tails are grouped upstream with headcount_by_company_from_cube(cube, top_n)
     for company, headcount in company_headcounts.items():
         fig.add_trace(go.Bar(
             x=list(headcount.keys()),
@@ -78,18 +316,13 @@ def create_company_headcount_chart(company_headcounts, title):
     return fig
 
 def compute_function_wise_attrition(data):
-    functions = data['odp_function'].unique()
-    function_wise_attrition = {}
-    for function in functions:
-        function_data = data[data['odp_function'] == function]
-        function_attrition_rates, _ = compute_attrition_and_headcount(function_data)
-        function_wise_attrition[function] = function_attrition_rates
-    return function_wise_attrition
+    return function_wise_attrition_from_cube(compute_attrition_cube(data, ['odp_function']))
 
+@traced
 def create_function_wise_chart(function_wise_attrition, title):
     fig = go.Figure()
     for function, attrition in function_wise_attrition.items():
-        fig.add_trace(go.Scatter(
+        fig.add_trace(line_trace(
             x=list(attrition.keys()),
             y=list(attrition.values()),
             mode='lines+markers',
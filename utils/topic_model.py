@@ -0,0 +1,232 @@
+# utils/topic_model.py
+#
+# Online topic model for review texts. scikit-learn's LatentDirichletAllocation is trained
+# with online variational Bayes (Hoffman et al., 2010), persisted between runs and updated
+# with partial_fit on only the reviews it has not seen yet. Each review's topic mixture is
+# stored, and topic prevalence per company and month is materialized for the dashboard.
+#
+# Words are hashed into a fixed number of buckets by a HashingVectorizer, so the model's
+# shape never changes as new vocabulary arrives.
+#
+# Only the Glassdoor sources of utils.review_store are modeled: the Play Store and Reddit
+# reviews exist only inside the notebooks, not as stored data.
+#
+# Usage: python -m utils.topic_model [--reset]
+
+import argparse
+import json
+import os
+import re
+import joblib
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import HashingVectorizer
+from utils.tracing import traced
+
+# Bump when the tokenizer or the model layout changes; each version gets its own folder
+TOPIC_MODEL_VERSION = 2
+TOPIC_MODEL_DIR = f'./data/reviews/topics/v{TOPIC_MODEL_VERSION}'
+
+NUM_TOPICS = 5
+VOCAB_BUCKETS = 1 << 14
+BATCH_SIZE = 256
+# Learning rate schedule rho_t = (TAU0 + t) ** -KAPPA and Dirichlet priors
+TAU0 = 64.0
+KAPPA = 0.7
+ALPHA = 1.0 / NUM_TOPICS
+ETA = 1.0 / NUM_TOPICS
+E_STEP_MAX_ITERATIONS = 100
+E_STEP_TOLERANCE = 1e-3
+RANDOM_SEED = 0
+
+STOP_WORDS = set("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further get got had has
+have having he her here hers him his how i if in into is it its itself just like lot lots me more most
+much my no nor not now of off on once only or other our ours out over own really same she should so
+some still such than that the their theirs them then there these they this those through to too under
+until up us very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+def tokenize(text):
+    """
+    Lowercase words of 3 to 15 letters, without stop words.
+    """
+    return [word for word in re.findall(r'[a-z]{3,15}', str(text).lower()) if word not in STOP_WORDS]
+
+_vectorizer = HashingVectorizer(n_features=VOCAB_BUCKETS, analyzer=tokenize, alternate_sign=False, norm=None)
+
+def _paths(model_dir):
+    return {
+        'model': os.path.join(model_dir, 'model.joblib'),
+        'words': os.path.join(model_dir, 'words.json'),
+        'doc_topics': os.path.join(model_dir, 'doc_topics.parquet'),
+        'aggregates': os.path.join(model_dir, 'topic_by_month.parquet'),
+    }
+
+def _new_lda():
+    return LatentDirichletAllocation(
+        n_components=NUM_TOPICS, doc_topic_prior=ALPHA, topic_word_prior=ETA, learning_method='online',
+        learning_offset=TAU0, learning_decay=KAPPA, batch_size=BATCH_SIZE, max_doc_update_iter=E_STEP_MAX_ITERATIONS,
+        mean_change_tol=E_STEP_TOLERANCE, random_state=RANDOM_SEED)
+
+def load_model(model_dir=TOPIC_MODEL_DIR):
+    """
+    Return the persisted model state, or a fresh untrained one.
+    """
+    paths = _paths(model_dir)
+    try:
+        lda = joblib.load(paths['model'])
+        with open(paths['words'], 'r') as file:
+            words = json.load(file)
+        return {'lda': lda, 'words': words}
+    except (OSError, EOFError, ValueError):
+        return {'lda': _new_lda(), 'words': {}}
+
+def save_model(model, model_dir=TOPIC_MODEL_DIR):
+    paths = _paths(model_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    tmp_path = f"{paths['model']}.tmp"
+    joblib.dump(model['lda'], tmp_path)
+    os.replace(tmp_path, paths['model'])
+    tmp_path = f"{paths['words']}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(model['words'], file)
+    os.replace(tmp_path, paths['words'])
+
+def is_trained(model):
+    return hasattr(model['lda'], 'components_')
+
+def update_model(model, texts, total_samples):
+    """
+    Update the model in place with new texts, one mini-batch of BATCH_SIZE at a time.
+    total_samples is the expected size of the whole corpus; each batch's statistics are
+    scaled to it. Returns the (texts x topics) topic mixtures of the texts, each row summing to 1.
+    """
+    if not texts:
+        return np.zeros((0, NUM_TOPICS))
+    for text in texts:
+        for token in tokenize(text):
+            model['words'][token] = model['words'].get(token, 0) + 1
+
+    counts = _vectorizer.transform(texts)
+    model['lda'].set_params(total_samples=max(total_samples, len(texts)))
+    model['lda'].partial_fit(counts)
+    return model['lda'].transform(counts)
+
+def topic_words(model, top_n=10):
+    """
+    Return the top_n most likely words of every topic.
+    Words sharing a hash bucket are represented by the most frequent of them.
+    """
+    if not is_trained(model) or not model['words']:
+        return [[] for _ in range(NUM_TOPICS)]
+    words = sorted(model['words'], key=lambda word: -model['words'][word])
+    # Each known word is a single token, so its row holds exactly one bucket
+    buckets = _vectorizer.transform(words).indices
+    representatives = {}
+    for bucket, word in zip(buckets, words):
+        representatives.setdefault(bucket, word)
+    buckets = np.array(sorted(representatives))
+    weights = model['lda'].components_[:, buckets]
+    return [[representatives[buckets[i]] for i in np.argsort(-row)[:top_n]] for row in weights]
+
+def _topic_columns():
+    return [f'topic_{topic}' for topic in range(NUM_TOPICS)]
+
+def update_from_reviews(reviews, text_columns=('Pros', 'Cons'), model_dir=TOPIC_MODEL_DIR):
+    """
+    Update the persisted model with the reviews it has not seen, then rebuild the topic-by-month table.
+    reviews is the whole corpus, with review_key, company and Month_Year columns; its size
+    is the expected corpus size the updates are scaled to. Returns the number of new reviews.
+    """
+    paths = _paths(model_dir)
+    doc_topics = pd.read_parquet(paths['doc_topics']) if os.path.exists(paths['doc_topics']) else None
+    total_samples = len(reviews)
+    if doc_topics is not None:
+        reviews = reviews[~reviews['review_key'].isin(doc_topics['review_key'])]
+    if reviews.empty:
+        return 0
+
+    model = load_model(model_dir)
+    texts = reviews[list(text_columns)].fillna('').astype(str).agg(' '.join, axis=1).tolist()
+    mixtures = update_model(model, texts, total_samples)
+    new_topics = pd.DataFrame(mixtures, columns=_topic_columns())
+    new_topics.insert(0, 'Month_Year', reviews['Month_Year'].to_numpy())
+    new_topics.insert(0, 'company', reviews['company'].to_numpy())
+    new_topics.insert(0, 'review_key', reviews['review_key'].to_numpy())
+    doc_topics = new_topics if doc_topics is None else pd.concat([doc_topics, new_topics], ignore_index=True)
+
+    save_model(model, model_dir)
+    tmp_path = f"{paths['doc_topics']}.tmp"
+    doc_topics.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, paths['doc_topics'])
+    aggregates = compute_topic_aggregates(doc_topics)
+    tmp_path = f"{paths['aggregates']}.tmp"
+    aggregates.reset_index().to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, paths['aggregates'])
+    return len(reviews)
+
+def compute_topic_aggregates(doc_topics):
+    """
+    Return the mean topic mixture and the review count per (company, Month_Year).
+    """
+    grouped = doc_topics.groupby(['company', 'Month_Year'], observed=True)
+    aggregates = grouped[_topic_columns()].mean()
+    aggregates['reviews'] = grouped.size()
+    return aggregates
+
+@traced
+def load_topic_aggregates(model_dir=TOPIC_MODEL_DIR):
+    """
+    Load the topic prevalence per company and month. Raises FileNotFoundError when no model was built.
+    """
+    aggregates_path = _paths(model_dir)['aggregates']
+    if not os.path.exists(aggregates_path):
+        raise FileNotFoundError("Missing topic aggregates. Run: python -m utils.topic_model")
+    return pd.read_parquet(aggregates_path, memory_map=True).set_index(['company', 'Month_Year'])
+
+@traced
+def create_topic_prevalence_chart(aggregates, company, labels=None):
+    """
+    Create a stacked area chart of a company's topic prevalence per month.
+    labels optionally names each topic (e.g. with its top words).
+    """
+    company_topics = aggregates.xs(company, level='company')
+    fig = go.Figure()
+    for topic, column in enumerate(_topic_columns()):
+        name = labels[topic] if labels else f'Topic {topic}'
+        fig.add_trace(go.Scatter(x=company_topics.index.astype(str), y=company_topics[column], mode='lines',
+                                 stackgroup='topics', name=name))
+    fig.update_layout(title=f'Review Topics Over Time - {company}', xaxis_title='Month and Year', yaxis_title='Topic Share')
+    return fig
+
+def main():
+    from utils.review_store import REVIEW_SOURCES, load_reviews
+
+    parser = argparse.ArgumentParser(description='Update the review topic model with new reviews.')
+    parser.add_argument('--reset', action='store_true', help='Discard the persisted model and start over')
+    parser.add_argument('--output', default=TOPIC_MODEL_DIR, help='Directory of the topic model')
+    args = parser.parse_args()
+    if args.reset:
+        for path in _paths(args.output).values():
+            if os.path.exists(path):
+                os.remove(path)
+
+    # The model is updated once with every company's reviews, so each batch is scaled to the whole corpus
+    frames = []
+    for company in REVIEW_SOURCES:
+        try:
+            frames.append(load_reviews(company))
+        except FileNotFoundError as e:
+            print(e)
+    if frames:
+        added = update_from_reviews(pd.concat(frames, ignore_index=True), model_dir=args.output)
+        print(f"{added} new reviews")
+    for topic, words in enumerate(topic_words(load_model(args.output))):
+        print(f"Topic {topic}: {', '.join(words)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# utils/tracing.py
+#
+# Lightweight per-rerun performance spans. Loaders, compute functions, chart builders,
+# translation and LLM calls are wrapped with @traced; while a trace is active in the
+# current script run their timings are recorded, otherwise the wrapper only checks a
+# context variable and calls through. Traces are shown as a waterfall in an opt-in
+# sidebar panel and can be exported in Chrome trace-event format (chrome://tracing, Perfetto).
+# Work handed to thread pools is traced when submitted with submit_in_context().
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar('trace', default=None)
+# Nesting depth of the running span; a context variable, so spans on other threads nest independently
+_depth = contextvars.ContextVar('trace_depth', default=0)
+
+def start_trace(name='rerun'):
+    """
+    Start recording spans for the current script run. Returns the trace.
+    """
+    trace = {'name': name, 'start': time.perf_counter(), 'wall_start': time.time(),
+             'thread': threading.get_ident(), 'spans': [], 'lock': threading.Lock()}
+    trace['token'] = _current.set(trace)
+    return trace
+
+def finish_trace(trace):
+    """
+    Stop recording and return the trace with its total duration.
+    Spans of work still running on other threads are dropped from then on.
+    """
+    with trace['lock']:
+        trace['duration'] = time.perf_counter() - trace['start']
+    _current.reset(trace.pop('token'))
+    return trace
+
+def _record(trace, name, start, depth, args):
+    end = time.perf_counter()
+    with trace['lock']:
+        # A finished trace is being rendered; late spans of background work are not added to it
+        if 'duration' in trace:
+            return
+        trace['spans'].append({
+            'name': name, 'start': start - trace['start'], 'duration': end - start,
+            'depth': depth, 'thread': threading.get_ident(), 'args': args,
+        })
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """
+    executor.submit(fn, ...) running fn in a copy of the caller's context, so its spans join the caller's trace.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+@contextmanager
+def span(name, **args):
+    """
+    Record the enclosed block as a span of the active trace, if any.
+    """
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        _record(trace, name, start, depth, args)
+
+def traced(fn=None, name=None):
+    """
+    Decorator recording every call of a function as a span. String arguments are kept as span details.
+    Use as @traced or @traced(name='...').
+    """
+    if fn is None:
+        return functools.partial(traced, name=name)
+    span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        trace = _current.get()
+        if trace is None:
+            return fn(*args, **kwargs)
+        depth = _depth.get()
+        token = _depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _depth.reset(token)
+            _record(trace, span_name, start, depth, {'args': [arg[:80] for arg in args if isinstance(arg, str)][:3]})
+    return wrapper
+
+def to_chrome_trace(trace):
+    """
+    Return the trace as a Chrome trace-event document (complete 'X' events, microseconds).
+    """
+    events = [{
+        'name': trace['name'], 'cat': 'rerun', 'ph': 'X', 'pid': os.getpid(), 'tid': trace['thread'],
+        'ts': 0, 'dur': round(trace.get('duration', 0) * 1e6), 'args': {'wall_start': trace['wall_start']},
+    }]
+    for item in trace['spans']:
+        events.append({
+            'name': item['name'], 'cat': item['name'].split('.', 1)[0], 'ph': 'X', 'pid': os.getpid(), 'tid': item['thread'],
+            'ts': round(item['start'] * 1e6), 'dur': round(item['duration'] * 1e6), 'args': item['args'],
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+def create_waterfall_chart(trace):
+    """
+    Create a Plotly waterfall of the trace's spans in start order, nested spans indented.
+    """
+    import plotly.graph_objects as go
+
+    spans = sorted(trace['spans'], key=lambda item: (item['start'], item['depth']))
+    labels = [f"{i:>3} {'  ' * item['depth']}{item['name']}" for i, item in enumerate(spans)]
+    fig = go.Figure(go.Bar(
+        y=labels, x=[item['duration'] * 1000 for item in spans], base=[item['start'] * 1000 for item in spans],
+        orientation='h', hovertemplate='%{y}<br>start %{base:.1f} ms, %{x:.1f} ms<extra></extra>'))
+    fig.update_layout(title=f"{trace['name']}: {trace.get('duration', 0) * 1000:.0f} ms", xaxis_title='ms',
+                      yaxis={'autorange': 'reversed'}, height=max(250, 22 * len(spans) + 100), margin={'l': 10, 'r': 10})
+    return fig
+
+def render_trace_panel(trace):
+    """
+    Show the trace of this rerun in the sidebar, with a Chrome trace download.
+    """
+    import streamlit as st
+
+    with st.sidebar.expander('Performance trace', expanded=True):
+        st.plotly_chart(create_waterfall_chart(trace), use_container_width=True)
+        st.download_button('Download Chrome trace', json.dumps(to_chrome_trace(trace)),
+                           file_name=f"trace-{time.strftime('%Y%m%d-%H%M%S', time.localtime(trace['wall_start']))}.json",
+                           mime='application/json')
@@ -0,0 +1,129 @@
+# utils/translation_catalog.py
+#
+# Build tool for the precompiled translation catalogs served by utils.translator.
+# Collects the string literals passed to translate()/translate_many() across the
+# codebase plus the static texts in config.toml, translates the ones missing from
+# the existing catalog and writes one compact JSON catalog per language.
+#
+# Usage: python -m utils.translation_catalog [--languages iw] [--dry-run]
+
+import argparse
+import ast
+import json
+import os
+import toml
+from utils.translator import CATALOG_DIR, catalog_path, translate_many
+
+# Folders scanned for translate() calls
+SOURCE_DIRS = ['.', './utils', './pillars', './legacy', './pages_old']
+TRANSLATE_FUNCTIONS = {'translate', 'translate_many'}
+# Templates Hello.py fills in with every pillar name from config.toml
+PILLAR_TEMPLATES = ['{pillar}', '{pillar} Analysis']
+CATALOG_LANGUAGES = ['iw']
+
+def _literal_strings(node):
+    """
+    Return the string constants of a translate() argument, looking into list literals and concatenations.
+    F-strings and other dynamic expressions are skipped.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [string for element in node.elts for string in _literal_strings(element)]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return _literal_strings(node.left) + _literal_strings(node.right)
+    return []
+
+def _function_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+def extract_source_strings(source_dirs=SOURCE_DIRS):
+    """
+    Return the string literals passed to translate()/translate_many() in every .py file of source_dirs.
+    """
+    strings = []
+    for source_dir in source_dirs:
+        for file_name in sorted(os.listdir(source_dir)):
+            if not file_name.endswith('.py'):
+                continue
+            file_path = os.path.join(source_dir, file_name)
+            with open(file_path, 'r', encoding='utf-8') as file:
+                try:
+                    tree = ast.parse(file.read(), filename=file_path)
+                except SyntaxError as e:
+                    print(f"Skipping {file_path}: {e}")
+                    continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call) and _function_name(node.func) in TRANSLATE_FUNCTIONS and node.args:
+                    strings += _literal_strings(node.args[0])
+    return strings
+
+def extract_config_strings(config_path='config.toml'):
+    """
+    Return the static texts of config.toml: documentation and pillar labels.
+    """
+    config = toml.load(config_path)
+    strings = [config['documentation']['text']]
+    for pillar in config['pillars']['names']:
+        strings += [template.format(pillar=pillar) for template in PILLAR_TEMPLATES]
+    return strings
+
+def extract_strings():
+    """
+    Return the de-duplicated static UI strings, in first-seen order.
+    """
+    strings = extract_source_strings() + extract_config_strings()
+    return [string for string in dict.fromkeys(strings) if string.strip()]
+
+def _read_catalog(target_language):
+    try:
+        with open(catalog_path(target_language), 'r', encoding='utf-8') as file:
+            return json.load(file)['strings']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def build_catalog(target_language, strings):
+    """
+    Write the catalog for target_language, translating only strings not already in it.
+    Strings no longer found in the codebase are dropped. Returns the number of strings translated.
+    """
+    existing = _read_catalog(target_language)
+    missing = [string for string in strings if string not in existing]
+    translated = translate_many(missing, target_language, latency_budget=None) if missing else {}
+
+    catalog = {}
+    for string in strings:
+        translation = existing.get(string, translated.get(string))
+        # translate_many falls back to the source text on errors; leave those to the online path
+        if translation is not None and translation != string:
+            catalog[string] = translation
+
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    tmp_path = f'{catalog_path(target_language)}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({'language': target_language, 'strings': catalog}, file, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, catalog_path(target_language))
+    print(f"{target_language}: {len(catalog)} strings ({len(missing)} newly translated)")
+    return len(missing)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the precompiled translation catalogs.')
+    parser.add_argument('--languages', nargs='+', default=CATALOG_LANGUAGES, help='Target language codes')
+    parser.add_argument('--dry-run', action='store_true', help='Only list the extracted strings')
+    args = parser.parse_args()
+
+    strings = extract_strings()
+    if args.dry_run:
+        for string in strings:
+            print(repr(string))
+        print(f"{len(strings)} strings")
+        return
+    for target_language in args.languages:
+        build_catalog(target_language, strings)
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,233 @@
 # translator.py
+import contextvars
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from deep_translator import GoogleTranslator
+from utils.tracing import span, traced
 
-def translate(text, target_language):
+# Precompiled catalogs of static UI strings, built by `python -m utils.translation_catalog`
+CATALOG_DIR = './locales'
+# Persistent translation memory shared by every session on the server
+TRANSLATION_DB_PATH = './data/.cache/translations.sqlite'
+# Number of translations kept in the in-process LRU
+MEMORY_CACHE_SIZE = 4096
+# Concurrent network translations for a page batch
+MAX_WORKERS = 8
+# Seconds a page waits on a batch before showing the remaining strings in English
+LATENCY_BUDGET = 2.0
+
+# Boundary after a complete sentence (or paragraph) in streamed text
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+_catalogs = {}
+_memory_cache = OrderedDict()
+_local = threading.local()
+_executor = None
+_in_flight = {}
+_connection = None
+_lock = threading.RLock()
+_stats = {'catalog_hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'errors': 0}
+
+def _cache_key(text, target_language):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest(), target_language
+
+def catalog_path(target_language):
+    return os.path.join(CATALOG_DIR, f'{target_language}.json')
+
+def _get_catalog(target_language):
+    catalog = _catalogs.get(target_language)
+    if catalog is None:
+        try:
+            with open(catalog_path(target_language), 'r', encoding='utf-8') as file:
+                catalog = json.load(file)['strings']
+        except (OSError, ValueError, KeyError):
+            catalog = {}
+        _catalogs[target_language] = catalog
+    return catalog
+
+def _lookup_catalog(text, target_language):
+    translation = _get_catalog(target_language).get(text)
+    if translation is not None:
+        with _lock:
+            _stats['catalog_hits'] += 1
+    return translation
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(TRANSLATION_DB_PATH), exist_ok=True)
+        _connection = sqlite3.connect(TRANSLATION_DB_PATH, check_same_thread=False)
+        # WAL with normal sync: a stored translation no longer waits on an fsync
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "text_hash TEXT NOT NULL, target_language TEXT NOT NULL, translation TEXT NOT NULL, "
+            "PRIMARY KEY (text_hash, target_language))")
+    return _connection
+
+def _remember(key, translation):
+    _memory_cache[key] = translation
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def _lookup(key):
+    """
+    Look a translation up in memory, then on disk. Returns None on a miss.
+    """
+    with _lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            _stats['memory_hits'] += 1
+            return _memory_cache[key]
+        try:
+            row = _get_connection().execute(
+                "SELECT translation FROM translations WHERE text_hash = ? AND target_language = ?", key).fetchone()
+        except sqlite3.Error as e:
+            print(f"Translation cache error: {e}")
+            row = None
+        if row is not None:
+            _stats['disk_hits'] += 1
+            _remember(key, row[0])
+            return row[0]
+        _stats['misses'] += 1
+        return None
+
+def _store(key, translation):
+    with _lock:
+        _remember(key, translation)
+        try:
+            with _get_connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO translations (text_hash, target_language, translation) VALUES (?, ?, ?)",
+                    key + (translation,))
+        except sqlite3.Error as e:
+            print(f"Translation cache error: {e}")
+
+def _get_translator(target_language):
+    # One translator per thread and language; instances hold a session and are not shared across threads
+    translators = getattr(_local, 'translators', None)
+    if translators is None:
+        translators = _local.translators = {}
+    if target_language not in translators:
+        translators[target_language] = GoogleTranslator(source='auto', target=target_language)
+    return translators[target_language]
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='translator')
+        return _executor
+
+@traced
+def _translate_online(text, target_language, key):
+    """
+    Translate through the network and store the result. Returns None on failure.
+    """
     try:
-        if target_language != "en":
-            return GoogleTranslator(source='auto', target=target_language).translate(text)
+        translation = _get_translator(target_language).translate(text)
     except Exception as e:
+        with _lock:
+            _stats['errors'] += 1
         print(f"Translation error: {e}")
-    return text
\ No newline at end of file
+        return None
+    if translation is None:
+        return None
+    _store(key, translation)
+    return translation
+
+def _submit(text, target_language, key):
+    # Sessions asking for the same string share one in-flight request. It runs in an empty
+    # context, so it belongs to no session's trace; each waiter records its own wait instead.
+    with _lock:
+        future = _in_flight.get(key)
+        if future is None:
+            future = _get_executor().submit(contextvars.Context().run, _translate_online, text, target_language, key)
+            _in_flight[key] = future
+            future.add_done_callback(lambda _: _in_flight.pop(key, None))
+        return future
+
+def get_cache_stats():
+    """
+    Return the translation cache hit/miss counters.
+    """
+    with _lock:
+        return dict(_stats)
+
+@traced
+def translate(text, target_language):
+    if target_language == "en" or not isinstance(text, str) or not text.strip():
+        return text
+    translation = _lookup_catalog(text, target_language)
+    if translation is not None:
+        return translation
+    key = _cache_key(text, target_language)
+    cached = _lookup(key)
+    if cached is not None:
+        return cached
+    translation = _translate_online(text, target_language, key)
+    return text if translation is None else translation
+
+@traced
+def translate_many(texts, target_language, latency_budget=LATENCY_BUDGET):
+    """
+    Translate every string a page needs in one batch and return {text: translation}.
+    Cached strings are served directly and the misses are translated concurrently on a bounded
+    thread pool. Strings still pending after latency_budget seconds fall back to English; their
+    translations keep running in the background and land in the cache for the next render.
+    """
+    translations = {}
+    futures = {}
+    for text in texts:
+        if text in translations or text in futures:
+            continue
+        if target_language == "en" or not text.strip():
+            translations[text] = text
+            continue
+        cached = _lookup_catalog(text, target_language)
+        if cached is not None:
+            translations[text] = cached
+            continue
+        key = _cache_key(text, target_language)
+        cached = _lookup(key)
+        if cached is not None:
+            translations[text] = cached
+        else:
+            futures[text] = _submit(text, target_language, key)
+
+    done = set()
+    if futures:
+        with span('translator.wait_online', pending=len(futures)):
+            done = wait(futures.values(), timeout=latency_budget).done
+    for text, future in futures.items():
+        translation = future.result() if future in done else None
+        translations[text] = text if translation is None else translation
+    return translations
+
+def translate_stream(pieces, target_language):
+    """
+    Translate streamed text sentence by sentence.
+    Consumes text pieces as they arrive and yields each complete sentence, translated,
+    followed by its original whitespace. Pieces pass through unchanged for English.
+    """
+    if target_language == "en":
+        yield from pieces
+        return
+    buffer = ''
+    for piece in pieces:
+        buffer += piece
+        position = 0
+        for boundary in SENTENCE_BOUNDARY.finditer(buffer):
+            yield translate(buffer[position:boundary.start()], target_language) + boundary.group()
+            position = boundary.end()
+        buffer = buffer[position:]
+    if buffer:
+        yield translate(buffer, target_language)